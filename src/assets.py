@@ -0,0 +1,129 @@
+import os
+import shutil
+
+from discovery import plan_assets, scan
+from generator import remove_empty_dirs
+from manifest import hash_file
+from records import load_records, save_records
+
+ASSETS_FILE = ".assets.json"
+COMPARE_MODES = ["mtime", "hash"]
+LINK_MODES = ["copy", "reflink", "hardlink"]
+# FICLONE from linux/fs.h, clones the extents of a file on filesystems such as btrfs and xfs
+FICLONE = 0x40049409
+
+
+def find_assets(source_dir):
+    return sorted((os.path.relpath(path, source_dir), path) for path, _, _ in scan(source_dir))
+
+def sync(source_dir, dest_dir, compare = "mtime", link = "copy", plan = None):
+    # plan is the (source, destination, kind, size, mtime_ns) list of discovery.plan_assets(), its
+    # metadata is trusted so unchanged assets cost no system call beyond a stat of the destination
+    if compare not in COMPARE_MODES:
+        raise ValueError(f"Unknown compare mode: {compare}")
+    if link not in LINK_MODES:
+        raise ValueError(f"Unknown link mode: {link}")
+    os.makedirs(dest_dir, exist_ok = True)
+    previous = load_records(dest_dir, ASSETS_FILE)
+    records = {}
+    copied = 0
+    if plan is None:
+        plan = plan_assets(source_dir, dest_dir)
+    for path, destination, _, size, mtime_ns in plan:
+        relative_path = os.path.relpath(destination, dest_dir)
+        record = {"size": size, "mtime_ns": mtime_ns}
+        previous_record = previous.get(relative_path)
+        if compare == "hash":
+            # only files whose metadata changed are read and hashed again
+            if previous_record is not None and same_metadata(previous_record, record) and "hash" in previous_record:
+                record["hash"] = previous_record["hash"]
+            else:
+                record["hash"] = hash_file(path)
+        records[relative_path] = record
+        unchanged = is_unchanged(previous_record, record, compare)
+        if unchanged and "output" in previous_record:
+            record["output"] = previous_record["output"]
+        if unchanged and is_synced(destination, record, compare):
+            continue
+        print(f"Copying {path} to {destination}")
+        os.makedirs(os.path.dirname(destination), exist_ok = True)
+        transfer(path, destination, link)
+        copied += 1
+    removed = 0
+    for relative_path in previous:
+        if relative_path in records:
+            continue
+        destination = os.path.join(dest_dir, relative_path)
+        if os.path.isfile(destination):
+            print(f"Removing stale asset {destination}")
+            os.remove(destination)
+            removed += 1
+        remove_empty_dirs(os.path.dirname(destination), dest_dir)
+    save_records(dest_dir, ASSETS_FILE, records)
+    print(f"Copied {copied} assets, skipped {len(records) - copied} unchanged, removed {removed} stale")
+    return copied, removed
+
+def same_metadata(previous_record, record):
+    return previous_record["size"] == record["size"] and previous_record["mtime_ns"] == record["mtime_ns"]
+
+def is_unchanged(previous_record, record, compare):
+    if previous_record is None:
+        return False
+    if compare == "hash":
+        return previous_record.get("hash") == record["hash"]
+    return same_metadata(previous_record, record)
+
+def is_synced(destination, record, compare):
+    # copies, reflinks and hardlinks all keep the size and mtime of their source, a copy rewritten
+    # after the build, such as a minified one, has the size and mtime recorded by record_outputs()
+    try:
+        dest_stat = os.stat(destination)
+    except FileNotFoundError:
+        return False
+    expected = record.get("output", record)
+    if compare == "hash":
+        return dest_stat.st_size == expected["size"]
+    return dest_stat.st_size == expected["size"] and dest_stat.st_mtime_ns == expected["mtime_ns"]
+
+def record_outputs(dest_dir, outputs):
+    # outputs maps relative paths in dest_dir to the size and mtime_ns of files rewritten in place,
+    # the next sync() takes them for the copies of unchanged assets instead of copying them again
+    records = load_records(dest_dir, ASSETS_FILE)
+    if len(records) == 0:
+        return
+    for relative_path, record in records.items():
+        output = outputs.get(relative_path)
+        if output is not None:
+            record["output"] = {"size": output["size"], "mtime_ns": output["mtime_ns"]}
+        else:
+            record.pop("output", None)
+    save_records(dest_dir, ASSETS_FILE, records)
+
+def transfer(path, destination, link):
+    if os.path.lexists(destination):
+        os.remove(destination)
+    if link == "hardlink":
+        try:
+            os.link(path, destination)
+            return
+        except OSError:
+            pass
+    if link == "reflink" and reflink(path, destination):
+        return
+    # shutil.copy2 uses os.sendfile on Linux, so the data never passes through Python buffers
+    shutil.copy2(path, destination)
+
+def reflink(path, destination):
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(path, "rb") as source_file, open(destination, "wb") as dest_file:
+            fcntl.ioctl(dest_file.fileno(), FICLONE, source_file.fileno())
+    except OSError:
+        if os.path.exists(destination):
+            os.remove(destination)
+        return False
+    shutil.copystat(path, destination)
+    return True
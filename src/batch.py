@@ -0,0 +1,62 @@
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from converter import markdown_to_html_node
+from frontmatter import split_front_matter
+from generator import render_markdown
+from template import Template, compile_template, rebase_urls
+from workers import resolve_jobs
+
+# documents submitted to the pool per worker before waiting for results, bounds memory on endless inputs
+PENDING_PER_WORKER = 4
+
+_worker_template = None
+_worker_base_path = "/"
+
+
+def render_document(markdown, template = None, base_path = "/"):
+    # without a template only the content is rendered, so the markdown needs no title
+    if template is None:
+        html_node = markdown_to_html_node(split_front_matter(markdown)[1])
+        rebase_urls(html_node, base_path)
+        return html_node.to_html()
+    title, content, _ = render_markdown(markdown, base_path)
+    return template.render({"Title": title, "Content": content})
+
+def render_many(markdowns, template = None, base_path = "/", jobs = 1):
+    # yields (index, html) for every markdown string of markdowns, template is template text or a
+    # Template from load_template() and is compiled once, with jobs > 1 documents are rendered in a
+    # worker pool and yielded as they complete, which is not necessarily the input order
+    if template is not None and not isinstance(template, Template):
+        template = compile_template(template, base_path)
+    jobs = resolve_jobs(jobs)
+    if jobs <= 1:
+        for index, markdown in enumerate(markdowns):
+            yield index, render_indexed(index, markdown, template, base_path)
+        return
+    with ProcessPoolExecutor(max_workers = jobs, initializer = init_worker, initargs = (template, base_path)) as executor:
+        pending = set()
+        for index, markdown in enumerate(markdowns):
+            pending.add(executor.submit(render_in_worker, index, markdown))
+            if len(pending) >= jobs * PENDING_PER_WORKER:
+                done, pending = wait(pending, return_when = FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when = FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+def render_indexed(index, markdown, template, base_path):
+    try:
+        return render_document(markdown, template, base_path)
+    except Exception as e:
+        raise Exception(f"Failed to render document {index}: {e}") from e
+
+def init_worker(template, base_path):
+    # the compiled template is sent once per worker instead of once per document
+    global _worker_template, _worker_base_path
+    _worker_template = template
+    _worker_base_path = base_path
+
+def render_in_worker(index, markdown):
+    return index, render_indexed(index, markdown, _worker_template, _worker_base_path)
@@ -0,0 +1,210 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from converter import block_to_block_type, markdown_to_blocks, markdown_to_html_node, text_to_textnodes
+from generator import generate_pages_recursive
+from htmlnode import LeafNode, ParentNode
+from textnode import TextNode, TextType
+
+WORDS = [
+    "elf", "ring", "hobbit", "wizard", "mountain", "river", "shire", "forest", "sword", "dragon",
+    "the", "and", "of", "a", "to", "in", "is", "was", "with", "under"
+]
+TEMPLATE = "<!doctype html><html><head><title>{{ Title }}</title>" \
+    "<link href=\"/index.css\" rel=\"stylesheet\" /></head><body><article>{{ Content }}</article></body></html>"
+
+
+def words(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+def inline_text(rng, count):
+    parts = []
+    for _ in range(count):
+        kind = rng.randrange(6)
+        if kind == 0:
+            parts.append(f"[{words(rng, 2)}](/{rng.choice(WORDS)}/{rng.randrange(1000)})")
+        elif kind == 1:
+            parts.append(f"![{words(rng, 2)}](/images/{rng.choice(WORDS)}.png)")
+        elif kind == 2:
+            parts.append(f"**{words(rng, 2)}**")
+        elif kind == 3:
+            parts.append(f"_{words(rng, 2)}_")
+        elif kind == 4:
+            parts.append(f"`{rng.choice(WORDS)}()`")
+        else:
+            parts.append(words(rng, 4))
+    return " ".join(parts)
+
+def link_heavy_corpus(size, seed = 0):
+    rng = random.Random(seed)
+    blocks = ["# Links"]
+    for _ in range(size):
+        blocks.append(inline_text(rng, 40))
+    return "\n\n".join(blocks)
+
+def nested_list_corpus(size, depth = 5, seed = 0):
+    rng = random.Random(seed)
+    blocks = ["# Lists"]
+    for _ in range(size):
+        lines = []
+        for level in range(depth):
+            for number in range(1, 4):
+                marker = f"{number}." if level % 2 else "-"
+                lines.append(f"{'  ' * level}{marker} {inline_text(rng, 3)}")
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks)
+
+def code_block_corpus(size, lines = 200, seed = 0):
+    rng = random.Random(seed)
+    blocks = ["# Code"]
+    for _ in range(size):
+        code = "\n".join(f"    {words(rng, 6)}(**kwargs) # _not_ `inline`" for _ in range(lines))
+        blocks.append(f"```\n{code}\n```")
+    return "\n\n".join(blocks)
+
+def small_pages_corpus(count, seed = 0):
+    rng = random.Random(seed)
+    pages = {}
+    for number in range(count):
+        path = os.path.join(f"section{number % 10}", f"page{number}", "index.md")
+        pages[path] = f"# Page {number}\n\n{inline_text(rng, 10)}\n\n- {words(rng, 3)}\n- {words(rng, 3)}"
+    return pages
+
+CORPORA = {
+    "link_heavy": link_heavy_corpus,
+    "nested_lists": nested_list_corpus,
+    "code_blocks": code_block_corpus
+}
+
+NODE_FACTORIES = {
+    "TextNode": lambda: TextNode("text", TextType.TEXT),
+    "LeafNode": lambda: LeafNode("b", "text"),
+    "ParentNode": lambda children = []: ParentNode("p", children)
+}
+
+def node_bytes(factory, count):
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        nodes = [factory() for _ in range(count)]
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    return (allocated - sys.getsizeof(nodes)) / count
+
+def run_node_benchmarks(count, repeat):
+    results = {}
+    memory = {}
+    for name, factory in NODE_FACTORIES.items():
+        results[f"construct[{name}]"] = time_call(lambda: [factory() for _ in range(count)], repeat)
+        memory[f"bytes_per_node[{name}]"] = node_bytes(factory, count)
+    return results, memory
+
+def time_call(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def run_benchmarks(size, pages, repeat):
+    results = {}
+    for name, corpus in CORPORA.items():
+        markdown = corpus(size)
+        blocks = markdown_to_blocks(markdown)
+        lines = [line for block in blocks for line in block.split("\n")]
+        html_node = markdown_to_html_node(markdown)
+        results[f"text_to_textnodes[{name}]"] = time_call(lambda: [text_to_textnodes(line) for line in lines], repeat)
+        results[f"markdown_to_blocks[{name}]"] = time_call(lambda: markdown_to_blocks(markdown), repeat)
+        results[f"block_to_block_type[{name}]"] = time_call(lambda: [block_to_block_type(block) for block in blocks], repeat)
+        results[f"markdown_to_html_node[{name}]"] = time_call(lambda: markdown_to_html_node(markdown), repeat)
+        results[f"to_html[{name}]"] = time_call(html_node.to_html, repeat)
+    results["generate_pages_recursive[small_pages]"] = time_call(lambda: build_site(small_pages_corpus(pages)), repeat)
+    return results
+
+def build_site(pages):
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            for path, markdown in pages.items():
+                path = os.path.join("content", path)
+                os.makedirs(os.path.dirname(path), exist_ok = True)
+                with open(path, "w") as file:
+                    file.write(markdown)
+            with open("template.html", "w") as file:
+                file.write(TEMPLATE)
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate_pages_recursive("content", "template.html", "docs", "/")
+        finally:
+            os.chdir(cwd)
+
+def find_regressions(results, baseline, threshold):
+    regressions = []
+    for name, seconds in results.items():
+        previous = baseline.get(name)
+        if previous is not None and seconds > previous * (1 + threshold):
+            regressions.append((name, previous, seconds))
+    return regressions
+
+def parse_args():
+    parser = argparse.ArgumentParser(description = "Benchmark the converter, HTML rendering and page generation")
+    parser.add_argument("--size", type = int, default = 200, help = "number of blocks per synthetic document")
+    parser.add_argument("--pages", type = int, default = 200, help = "number of pages in the full build")
+    parser.add_argument("--nodes", type = int, default = 100000, help = "number of nodes in the node benchmarks")
+    parser.add_argument("--repeat", type = int, default = 5, help = "runs per benchmark, the fastest one is kept")
+    parser.add_argument("--output", help = "write results to this JSON file")
+    parser.add_argument("--baseline", help = "compare against results saved with --output")
+    parser.add_argument("--threshold", type = float, default = 0.2,
+        help = "fail when a benchmark is slower than the baseline by more than this fraction")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    results = run_benchmarks(args.size, args.pages, args.repeat)
+    node_results, memory = run_node_benchmarks(args.nodes, args.repeat)
+    results.update(node_results)
+    for name, seconds in results.items():
+        print(f"{name:<45} {seconds * 1000:10.3f} ms")
+    for name, size in memory.items():
+        print(f"{name:<45} {size:10.1f} bytes")
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump({
+                "meta": {
+                    "size": args.size,
+                    "pages": args.pages,
+                    "nodes": args.nodes,
+                    "repeat": args.repeat,
+                    "python": platform.python_version()
+                },
+                "results": results,
+                "memory": memory
+            }, file, indent = 2)
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = find_regressions(results, baseline["results"], args.threshold)
+        for name, previous, seconds in regressions:
+            print(f"Regression in {name}: {previous * 1000:.3f} ms -> {seconds * 1000:.3f} ms")
+        memory_regressions = find_regressions(memory, baseline.get("memory", {}), args.threshold)
+        for name, previous, size in memory_regressions:
+            print(f"Regression in {name}: {previous:.1f} bytes -> {size:.1f} bytes")
+        regressions += memory_regressions
+        if len(regressions) > 0:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import hashlib
+import os
+import pickle
+import zlib
+
+from converter import InlineCache, converter_version
+from htmlnode import LeafNode, ParentNode
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# bump whenever the layout of a cache entry changes
+CACHE_FORMAT = 2
+LEAF = 0
+PARENT = 1
+
+
+def encode_node(node):
+    # nodes are stored as plain tuples, which pickle far smaller and faster than node objects
+    if type(node) is LeafNode:
+        return (LEAF, node.tag, node.value, node.props)
+    if type(node) is ParentNode:
+        return (PARENT, node.tag, node.props, [encode_node(child) for child in node.children])
+    raise TypeError(f"Cannot cache node of type {type(node).__name__}")
+
+def decode_node(data):
+    if data[0] == LEAF:
+        return LeafNode(data[1], data[2], data[3])
+    return ParentNode(data[1], [decode_node(child) for child in data[3]], data[2])
+
+class ParseCache:
+    def __init__(self, cache_dir, max_bytes = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, markdown):
+        return hashlib.sha256(f"{CACHE_FORMAT};{converter_version()}\0{markdown}".encode()).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.bin")
+
+    def get(self, markdown):
+        path = self.path(self.key(markdown))
+        try:
+            with open(path, "rb") as file:
+                title, data, references = pickle.loads(zlib.decompress(file.read()))
+        except (OSError, ValueError, EOFError, zlib.error, pickle.UnpicklingError):
+            self.misses += 1
+            return None
+        # the mtime of an entry is its last use, which is what prune() evicts by
+        os.utime(path)
+        self.hits += 1
+        return title, decode_node(data), references
+
+    def put(self, markdown, title, html_node, references):
+        try:
+            data = encode_node(html_node)
+        except TypeError:
+            return
+        path = self.path(self.key(markdown))
+        os.makedirs(os.path.dirname(path), exist_ok = True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(zlib.compress(pickle.dumps((title, data, references), pickle.HIGHEST_PROTOCOL), 1))
+        os.replace(temp_path, path)
+
+    def prune(self):
+        entries = []
+        total = 0
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        with os.scandir(self.cache_dir) as shards:
+            for shard in shards:
+                if not shard.is_dir():
+                    continue
+                with os.scandir(shard.path) as files:
+                    for entry in files:
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                        total += stat.st_size
+        evicted = 0
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+            evicted += 1
+        return evicted
+
+def load_inline_cache(path, max_entries):
+    # the inline cache saved by the last build, entries of another converter version are dropped
+    cache = InlineCache(max_entries)
+    try:
+        with open(path, "rb") as file:
+            version, items = pickle.loads(zlib.decompress(file.read()))
+    except (OSError, ValueError, EOFError, zlib.error, pickle.UnpicklingError):
+        return cache
+    if version == f"{CACHE_FORMAT};{converter_version()}":
+        cache.warm(items)
+    return cache
+
+def save_inline_cache(cache, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok = True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as file:
+        data = (f"{CACHE_FORMAT};{converter_version()}", cache.snapshot())
+        file.write(zlib.compress(pickle.dumps(data, pickle.HIGHEST_PROTOCOL), 1))
+    os.replace(temp_path, path)
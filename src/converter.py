@@ -1,28 +1,56 @@
+import contextlib
+import contextvars
 import re
+from collections import OrderedDict
 
 from blocktype import BlockType
 from htmlnode import LeafNode, ParentNode
 from textnode import TextNode, TextType
 
+IMAGE_PATTERN = re.compile(r"!\[(.*?)\]\((.*?)\)")
+LINK_PATTERN = re.compile(r"\[(.*?)\]\((.*?)\)")
+DELIMITER_PATTERN = re.compile(r"\*\*|_|`")
+HEADING_PATTERN = re.compile(r"^#{1,6} ")
+CODE_PATTERN = re.compile(r"^```.*```$", re.DOTALL)
+# "- " or a number of up to 9 digits and ". ", the indentation before it nests lists
+LIST_ITEM_PATTERN = re.compile(r"^( *)(?:-|(\d{1,9})\.)(?: +|$)")
+ORDERED_LIST_PATTERN = re.compile(r"^\d{1,9}\. ")
+# bump whenever the HTML produced for the same markdown changes, it invalidates cached parse trees
+CONVERTER_VERSION = 4
+
+# set by collect_references(), the inline scanner records link and image urls into it as it parses
+current_references = contextvars.ContextVar("current_references", default = None)
+DEFAULT_INLINE_CACHE_SIZE = 4096
+# set by set_inline_cache(), text_to_children() reuses the fragments it holds when it is not None
+inline_cache = None
+
 
 def text_node_to_html_node(text_node):
-    # no match/case in Python < 3.10 :(
-    if text_node.text_type is TextType.TEXT:
-        return LeafNode(tag = None, value = text_node.text)
-    if text_node.text_type is TextType.BOLD:
-        return LeafNode(tag = "b", value = text_node.text)
-    if text_node.text_type is TextType.ITALIC:
-        return LeafNode(tag = "i", value = text_node.text)
-    if text_node.text_type is TextType.CODE:
-        return LeafNode(tag = "code", value = text_node.text)
-    if text_node.text_type is TextType.LINK:
-        return LeafNode(tag = "a", value = text_node.text, props = {"href": text_node.url})
-    if text_node.text_type is TextType.IMAGE:
-        return LeafNode(tag = "img", value = "", props = {
-            "src": text_node.url,
-            "alt": text_node.text
-        })
-    raise Exception(f"Unknown text type: {text_node.text_type}")
+    renderer = TEXT_RENDERERS.get(text_node.text_type)
+    if renderer is None:
+        raise Exception(f"Unknown text type: {text_node.text_type}")
+    return renderer(text_node)
+
+def text_to_leaf_node(text_node):
+    return LeafNode(tag = None, value = text_node.text)
+
+def bold_to_leaf_node(text_node):
+    return LeafNode(tag = "b", value = text_node.text)
+
+def italic_to_leaf_node(text_node):
+    return LeafNode(tag = "i", value = text_node.text)
+
+def code_to_leaf_node(text_node):
+    return LeafNode(tag = "code", value = text_node.text)
+
+def link_to_leaf_node(text_node):
+    return LeafNode(tag = "a", value = text_node.text, props = {"href": text_node.url})
+
+def image_to_leaf_node(text_node):
+    return LeafNode(tag = "img", value = "", props = {
+        "src": text_node.url,
+        "alt": text_node.text
+    })
 
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
     new_nodes = []
@@ -42,10 +70,10 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type):
     return new_nodes
 
 def extract_markdown_images(text):
-    return re.findall(r"!\[(.*?)\]\((.*?)\)", text)
+    return IMAGE_PATTERN.findall(text)
 
 def extract_markdown_links(text):
-    return re.findall(r"\[(.*?)\]\((.*?)\)", text)
+    return LINK_PATTERN.findall(text)
 
 def split_nodes_image(old_nodes):
     new_nodes = []
@@ -92,87 +120,410 @@ def split_nodes_link(old_nodes):
     return new_nodes
 
 def text_to_textnodes(text):
-    new_nodes = [TextNode(text, TextType.TEXT)]
-    new_nodes = split_nodes_image(new_nodes)
-    new_nodes = split_nodes_link(new_nodes)
-    new_nodes = split_nodes_delimiter(new_nodes, "**", TextType.BOLD)
-    new_nodes = split_nodes_delimiter(new_nodes, "_", TextType.ITALIC)
-    return split_nodes_delimiter(new_nodes, "`", TextType.CODE)
+    # Single pass equivalent of split_nodes_image -> split_nodes_link -> split_nodes_delimiter
+    # for "**", "_" and "`": every span of the text is scanned once and nodes are emitted in order
+    new_nodes = []
+    references = current_references.get()
+    start = 0
+    for image in IMAGE_PATTERN.finditer(text):
+        scan_links(text, start, image.start(), new_nodes, references)
+        new_nodes.append(TextNode(image.group(1), TextType.IMAGE, image.group(2)))
+        if references is not None:
+            references["images"].append(image.group(2))
+        start = image.end()
+    scan_links(text, start, len(text), new_nodes, references)
+    return new_nodes
+
+def scan_links(text, start, end, new_nodes, references = None):
+    for link in LINK_PATTERN.finditer(text, start, end):
+        scan_delimiters(text, start, link.start(), new_nodes)
+        new_nodes.append(TextNode(link.group(1), TextType.LINK, link.group(2)))
+        if references is not None:
+            references["links"].append(link.group(2))
+        start = link.end()
+    scan_delimiters(text, start, end, new_nodes)
+
+@contextlib.contextmanager
+def collect_references():
+    references = {"links": [], "images": []}
+    token = current_references.set(references)
+    try:
+        yield references
+    finally:
+        current_references.reset(token)
+
+def scan_delimiters(text, start, end, new_nodes):
+    # "**" always toggles bold, "_" is literal inside bold and "`" is literal inside bold or italic,
+    # matching the order in which the delimiter passes used to run
+    bold = italic = code = False
+    for match in DELIMITER_PATTERN.finditer(text, start, end):
+        delimiter = match.group()
+        if delimiter != "**" and (bold or (italic and delimiter == "`")):
+            continue
+        append_text_node(text, start, match.start(), bold, italic, code, new_nodes)
+        if delimiter == "**":
+            bold = not bold
+            italic = code = False
+        elif delimiter == "_":
+            italic = not italic
+            code = False
+        else:
+            code = not code
+        start = match.end()
+    append_text_node(text, start, end, bold, italic, code, new_nodes)
+
+def append_text_node(text, start, end, bold, italic, code, new_nodes):
+    if start >= end:
+        return
+    if bold:
+        text_type = TextType.BOLD
+    elif italic:
+        text_type = TextType.ITALIC
+    elif code:
+        text_type = TextType.CODE
+    else:
+        text_type = TextType.TEXT
+    new_nodes.append(TextNode(text[start:end], text_type))
 
 def markdown_to_blocks(markdown):
-    blocks = markdown.split("\n\n")
-    blocks = list(map(lambda block: block.strip(), blocks))
-    return list(filter(lambda block: len(block) > 0, blocks))
+    return list(join_list_blocks(markdown.split("\n\n")))
 
-def block_to_block_type(block):
-    if re.match(r"^#{1,6} ", block) is not None:
-        return BlockType.HEADING
-    if re.match(r"^```.*```$", block, re.DOTALL) is not None:
-        return BlockType.CODE
-    lines = block.split("\n")
-    if all(line.startswith(">") for line in lines):
-        return BlockType.QUOTE
-    if all(line.startswith("- ") for line in lines):
+def iter_blocks(lines):
+    # lazy equivalent of markdown_to_blocks for a file object or any other iterable of lines,
+    # an empty line ends the current block
+    return join_list_blocks(iter_raw_blocks(lines))
+
+def iter_raw_blocks(lines):
+    block_lines = []
+    for line in lines:
+        line = line.rstrip("\n")
+        if len(line) > 0:
+            block_lines.append(line)
+            continue
+        yield "\n".join(block_lines)
+        block_lines = []
+    yield "\n".join(block_lines)
+
+def join_list_blocks(raw_blocks):
+    # a block that is indented to the content of the list's top level items, or starts with an item of
+    # the same kind, continues the list block before it, so list items can have several paragraphs and
+    # loose lists stay one list. a top level item of the other kind ends the list and starts a new one
+    pending = []
+    pending_kind = None
+    content_indent = 0
+    for raw_block in raw_blocks:
+        raw_block = raw_block.strip("\n").rstrip()
+        if len(raw_block.lstrip()) == 0:
+            continue
+        lines = raw_block.split("\n")
+        if pending_kind is not None and continues_list(lines[0], pending_kind, content_indent):
+            pending.append("")
+        else:
+            if len(pending) > 0:
+                yield "\n".join(pending)
+            lines[0] = lines[0].lstrip()
+            pending = []
+            pending_kind = list_kind(lines[0])
+            content_indent = 0
+        for line in lines:
+            match = LIST_ITEM_PATTERN.match(line.expandtabs(4)) if pending_kind is not None else None
+            if match is None or len(match.group(1)) >= content_indent > 0:
+                pending.append(line)
+                continue
+            if item_kind(match) != pending_kind:
+                yield "\n".join(pending)
+                line = line.lstrip()
+                match = LIST_ITEM_PATTERN.match(line)
+                pending = []
+                pending_kind = item_kind(match)
+            content_indent = match.end()
+            pending.append(line)
+    if len(pending) > 0:
+        yield "\n".join(pending)
+
+def continues_list(line, kind, content_indent):
+    line = line.expandtabs(4)
+    match = LIST_ITEM_PATTERN.match(line)
+    return len(line) - len(line.lstrip(" ")) >= content_indent or match is not None and item_kind(match) == kind
+
+def list_kind(block):
+    if block.startswith("- "):
         return BlockType.UNORDERED_LIST
-    if is_ordered_list(lines):
+    if ORDERED_LIST_PATTERN.match(block) is not None:
         return BlockType.ORDERED_LIST
-    return BlockType.PARAGRAPH
+    return None
+
+def item_kind(match):
+    return BlockType.UNORDERED_LIST if match.group(2) is None else BlockType.ORDERED_LIST
 
-def is_ordered_list(lines):
-    if len(lines) == 0 or not lines[0].startswith("1. "):
-        return False
-    for idx, line in enumerate(lines[1:]):
-        if not line.startswith(f"{idx + 2}. "):
-            return False
-    return True
+def block_to_block_type(block):
+    return classify_block(block)[0]
+
+def classify_block(block):
+    # a block can only be of the types its first character allows, so only those checks run,
+    # and the lines are split once and handed on to block_to_html_node
+    first = block[:1]
+    for block_type, matcher in BLOCK_MATCHERS.get(first, ()):
+        lines = matcher(block)
+        if lines is not None:
+            return block_type, lines
+    if first == "#":
+        if HEADING_PATTERN.match(block) is not None:
+            return BlockType.HEADING, None
+        return BlockType.PARAGRAPH, None
+    if first == "`":
+        if CODE_PATTERN.match(block) is not None:
+            return BlockType.CODE, None
+        return BlockType.PARAGRAPH, None
+    if first == ">":
+        lines = block.split("\n")
+        if all(line.startswith(">") for line in lines):
+            return BlockType.QUOTE, lines
+        return BlockType.PARAGRAPH, None
+    # only the first line has to be an item, later lines are items, nested items or continuation lines
+    if first == "-":
+        if block.startswith("- "):
+            return BlockType.UNORDERED_LIST, block.split("\n")
+        return BlockType.PARAGRAPH, None
+    if "0" <= first <= "9":
+        if ORDERED_LIST_PATTERN.match(block) is not None:
+            return BlockType.ORDERED_LIST, block.split("\n")
+    return BlockType.PARAGRAPH, None
 
 def markdown_to_html_node(markdown):
-    blocks = markdown_to_blocks(markdown)
-    block_nodes = []
-    for block in blocks:
-        block_type = block_to_block_type(block)
-        if block_type == BlockType.PARAGRAPH:
-            block = block.replace("\n", " ")
-            text_nodes = text_to_textnodes(block)
-            html_nodes = list(map(lambda text_node: text_node_to_html_node(text_node), text_nodes))
-            block_nodes.append(ParentNode(tag = "p", children = html_nodes))
-        if block_type == BlockType.CODE:
-            block = block.replace("```", "").lstrip()
-            text_node = TextNode(text = block, text_type = TextType.TEXT)
-            html_node = text_node_to_html_node(text_node)
-            code = ParentNode(tag = "code", children = [html_node])
-            block_nodes.append(ParentNode(tag = "pre", children = [code]))
-        if block_type == BlockType.HEADING:
-            number_of_hash_marks = get_number_of_hash_marks(block)
-            block = block.lstrip("#").lstrip()
-            text_nodes = text_to_textnodes(block)
-            html_nodes = list(map(lambda text_node: text_node_to_html_node(text_node), text_nodes))
-            block_nodes.append(ParentNode(tag = f"h{number_of_hash_marks}", children = html_nodes))
-        if block_type == BlockType.QUOTE:
-            block = block.replace("> ", "").replace("\n", " ").lstrip().replace("> ", "")
-            text_nodes = text_to_textnodes(block)
-            html_nodes = list(map(lambda text_node: text_node_to_html_node(text_node), text_nodes))
-            block_nodes.append(ParentNode(tag = "blockquote", children = html_nodes))
-        if block_type == BlockType.UNORDERED_LIST:
-            lines = block.split("\n")
-            lis = []
-            for line in lines:
-                line = line.replace("- ", "").strip()
-                text_nodes = text_to_textnodes(line)
-                html_nodes = list(map(lambda text_node: text_node_to_html_node(text_node), text_nodes))
-                lis.append(ParentNode(tag = "li", children = html_nodes))
-            block_nodes.append(ParentNode(tag = "ul", children = lis))
-        if block_type == BlockType.ORDERED_LIST:
-            lines = block.split("\n")
-            lis = []
-            for line in lines:
-                line = re.sub(r"^\d\. ", "", line).strip()
-                text_nodes = text_to_textnodes(line)
-                html_nodes = list(map(lambda text_node: text_node_to_html_node(text_node), text_nodes))
-                lis.append(ParentNode(tag = "li", children = html_nodes))
-            block_nodes.append(ParentNode(tag = "ol", children = lis))
+    return blocks_to_html_node(parse_blocks(markdown))
+
+def parse_blocks(markdown):
+    return [(block, *classify_block(block)) for block in markdown_to_blocks(markdown)]
+
+def blocks_to_html_node(typed_blocks):
+    block_nodes = [block_to_html_node(block, block_type, lines) for block, block_type, lines in typed_blocks]
     return ParentNode(tag = "div", children = block_nodes)
 
+def iter_block_nodes(lines):
+    for block in iter_blocks(lines):
+        yield block_to_html_node(block)
+
+def block_to_html_node(block, block_type = None, lines = None):
+    if block_type is None:
+        block_type, lines = classify_block(block)
+    renderer = BLOCK_RENDERERS.get(block_type)
+    if renderer is None:
+        raise Exception(f"Unknown block type: {block_type}")
+    return renderer(block, lines)
+
+class InlineCache:
+    # bounded LRU of inline markdown -> (parts, links, images), parts are raw html strings for runs of
+    # leaves without props and (tag, value, props) for links and images, which are rebased later on
+    def __init__(self, max_entries = DEFAULT_INLINE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # entries put since the last take_added(), kept by worker processes to send them back
+        self.added = None
+
+    def get(self, text):
+        entry = self.entries.get(text)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(text)
+        self.hits += 1
+        return entry
+
+    def put(self, text, entry):
+        self.entries[text] = entry
+        self.entries.move_to_end(text)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last = False)
+        if self.added is not None:
+            self.added.append((text, entry))
+
+    def take_added(self):
+        added = self.added or []
+        if self.added is not None:
+            self.added = []
+        return added
+
+    def clear(self):
+        self.entries.clear()
+
+    def snapshot(self, limit = None):
+        # the most recently used entries, for warming the caches of worker processes and saving
+        items = list(self.entries.items())
+        return items if limit is None else items[max(0, len(items) - limit):]
+
+    def warm(self, items):
+        for text, entry in items:
+            self.put(text, entry)
+
+    def counts(self):
+        return self.hits, self.misses
+
+def set_inline_cache(cache):
+    global inline_cache
+    inline_cache = cache
+
+def init_inline_cache(max_entries, items = ()):
+    # process pool initializer, every worker gets its own cache warmed with the entries of the parent,
+    # which loads them from the last build, and hands the entries it adds back with its results
+    cache = InlineCache(max_entries)
+    cache.warm(items)
+    cache.added = []
+    set_inline_cache(cache)
+
+def inline_cache_counts():
+    return inline_cache.counts() if inline_cache is not None else (0, 0)
+
+def hit_rate(hits, misses):
+    return hits / (hits + misses) if hits + misses > 0 else 0.0
+
+def text_to_children(text):
+    if inline_cache is None:
+        return [text_node_to_html_node(text_node) for text_node in text_to_textnodes(text)]
+    entry = inline_cache.get(text)
+    if entry is None:
+        with collect_references() as references:
+            children = [text_node_to_html_node(text_node) for text_node in text_to_textnodes(text)]
+        entry = inline_entry(children, references)
+        if entry is not None:
+            inline_cache.put(text, entry)
+        replay_references(references["links"], references["images"])
+        return children
+    parts, links, images = entry
+    replay_references(links, images)
+    return [LeafNode(None, part) if type(part) is str else LeafNode(part[0], part[1], dict(part[2])) for part in parts]
+
+def inline_entry(children, references):
+    # returns None for fragments with nodes other than leaves, such as those of custom renderers
+    parts = []
+    run = []
+    for child in children:
+        if type(child) is not LeafNode:
+            return None
+        if child.props is None:
+            run.append(child.to_html())
+            continue
+        if len(run) > 0:
+            parts.append("".join(run))
+            run = []
+        parts.append((child.tag, child.value, dict(child.props)))
+    if len(run) > 0:
+        parts.append("".join(run))
+    return tuple(parts), tuple(references["links"]), tuple(references["images"])
+
+def replay_references(links, images):
+    references = current_references.get()
+    if references is not None:
+        references["links"].extend(links)
+        references["images"].extend(images)
+
+def paragraph_to_html_node(block, lines):
+    return ParentNode(tag = "p", children = text_to_children(block.replace("\n", " ")))
+
+def code_to_html_node(block, lines):
+    block = block.replace("```", "").lstrip()
+    text_node = TextNode(text = block, text_type = TextType.TEXT)
+    html_node = text_node_to_html_node(text_node)
+    code = ParentNode(tag = "code", children = [html_node])
+    return ParentNode(tag = "pre", children = [code])
+
+def heading_to_html_node(block, lines):
+    number_of_hash_marks = get_number_of_hash_marks(block)
+    block = block.lstrip("#").lstrip()
+    return ParentNode(tag = f"h{number_of_hash_marks}", children = text_to_children(block))
+
+def quote_to_html_node(block, lines):
+    block = block.replace("> ", "").replace("\n", " ").lstrip().replace("> ", "")
+    return ParentNode(tag = "blockquote", children = text_to_children(block))
+
+def unordered_list_to_html_node(block, lines):
+    return list_to_html_node(block.split("\n") if lines is None else lines)
+
+def ordered_list_to_html_node(block, lines):
+    return list_to_html_node(block.split("\n") if lines is None else lines)
+
+def list_to_html_node(lines):
+    # one pass over the lines with a stack of the open lists, each [node, content indent, item], an item
+    # is a list of paragraphs (lists of lines) and nested list nodes and becomes an li when its list gets
+    # its next item or is closed. a marker indented as far as the content of the current item opens a
+    # nested list, one that is not inside the content of the enclosing item closes lists. after a blank
+    # line, a line starts a new paragraph in the innermost item whose content it is indented to, any
+    # other line continues the innermost item, also when it is not indented (lazy continuation).
+    # join_list_blocks() already ends the block at a top level item of the other kind and at a paragraph
+    # that is not indented to the content of the top level items
+    stack = []
+    blank = False
+    for line in lines:
+        line = line.expandtabs(4)
+        if len(line.strip()) == 0:
+            blank = True
+            continue
+        match = LIST_ITEM_PATTERN.match(line)
+        if match is None:
+            if len(stack) == 0:
+                continue
+            if blank:
+                indent = len(line) - len(line.lstrip(" "))
+                while len(stack) > 1 and indent < stack[-1][1]:
+                    close_list(stack)
+                stack[-1][2].append([line.strip()])
+            elif type(stack[-1][2][-1]) is list:
+                stack[-1][2][-1].append(line.strip())
+            else:
+                stack[-1][2].append([line.strip()])
+            blank = False
+            continue
+        blank = False
+        indent = len(match.group(1))
+        while len(stack) > 1 and indent < stack[-2][1]:
+            close_list(stack)
+        item = [[line[match.end():].strip()]]
+        if len(stack) > 0 and indent < stack[-1][1]:
+            if len(stack) == 1 or (match.group(2) is None) == (stack[-1][0].tag == "ul"):
+                close_item(stack[-1])
+                stack[-1][1] = match.end()
+                stack[-1][2] = item
+                continue
+            # an item of the other kind ends the nested list, a new list of its kind follows it in the item
+            close_list(stack)
+        if match.group(2) is None:
+            node = ParentNode(tag = "ul", children = [])
+        else:
+            start = int(match.group(2))
+            node = ParentNode(tag = "ol", children = [], props = {"start": str(start)} if start != 1 else None)
+        if len(stack) > 0:
+            stack[-1][2].append(node)
+        stack.append([node, match.end(), item])
+    if len(stack) == 0:
+        raise Exception("List has no items")
+    while len(stack) > 1:
+        close_list(stack)
+    close_item(stack[0])
+    return stack[0][0]
+
+def close_list(stack):
+    close_item(stack.pop())
+
+def close_item(frame):
+    # an item with more than one paragraph gets a p for each, a single one is inlined into the li
+    node, _, parts = frame
+    paragraphs = sum(1 for part in parts if type(part) is list)
+    children = []
+    for part in parts:
+        if type(part) is not list:
+            children.append(part)
+            continue
+        text = " ".join(line for line in part if len(line) > 0)
+        if len(text) == 0:
+            continue
+        if paragraphs > 1:
+            children.append(ParentNode(tag = "p", children = text_to_children(text)))
+        else:
+            children.extend(text_to_children(text))
+    node.children.append(ParentNode(tag = "li", children = children))
+
 def get_number_of_hash_marks(txt):
     number_of_hash_marks = 0
     for char in txt:
@@ -180,4 +531,43 @@ def get_number_of_hash_marks(txt):
             number_of_hash_marks += 1
         else:
             break
-    return number_of_hash_marks
\ No newline at end of file
+    return number_of_hash_marks
+
+TEXT_RENDERERS = {
+    TextType.TEXT: text_to_leaf_node,
+    TextType.BOLD: bold_to_leaf_node,
+    TextType.ITALIC: italic_to_leaf_node,
+    TextType.CODE: code_to_leaf_node,
+    TextType.LINK: link_to_leaf_node,
+    TextType.IMAGE: image_to_leaf_node
+}
+BLOCK_RENDERERS = {
+    BlockType.PARAGRAPH: paragraph_to_html_node,
+    BlockType.CODE: code_to_html_node,
+    BlockType.HEADING: heading_to_html_node,
+    BlockType.QUOTE: quote_to_html_node,
+    BlockType.UNORDERED_LIST: unordered_list_to_html_node,
+    BlockType.ORDERED_LIST: ordered_list_to_html_node
+}
+# first character of a block -> [(block type, matcher)], checked before the built-in block types
+BLOCK_MATCHERS = {}
+custom_renderers = []
+
+def register_text_renderer(text_type, renderer):
+    TEXT_RENDERERS[text_type] = renderer
+    custom_renderers.append(f"{text_type}={renderer.__module__}.{renderer.__qualname__}")
+    if inline_cache is not None:
+        inline_cache.clear()
+
+def register_block_type(block_type, renderer, first_chars = "", matcher = None):
+    # matcher(block) returns None when the block is not of this type, anything else is handed to
+    # renderer(block, lines) as lines, it only runs for blocks starting with one of first_chars
+    BLOCK_RENDERERS[block_type] = renderer
+    if matcher is not None:
+        for char in first_chars:
+            BLOCK_MATCHERS.setdefault(char, []).append((block_type, matcher))
+    custom_renderers.append(f"{block_type}={renderer.__module__}.{renderer.__qualname__}")
+
+def converter_version():
+    # cached parse trees are only valid for the same converter and the same custom renderers
+    return ";".join([str(CONVERTER_VERSION)] + custom_renderers)
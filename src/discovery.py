@@ -0,0 +1,51 @@
+import os
+
+PAGE = "page"
+ASSET = "asset"
+PAGE_EXTENSION = ".md"
+
+
+def scan(dir_path):
+    # yields (path, size, mtime_ns) for every file below dir_path, directory entries carry their
+    # type so only files are stat'ed, once each
+    stack = [dir_path]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    stat = entry.stat()
+                    yield entry.path, stat.st_size, stat.st_mtime_ns
+
+def get_destination(path, source_dir, dest_dir):
+    relative_path = os.path.relpath(path, source_dir)
+    root, extension = os.path.splitext(relative_path)
+    if extension == PAGE_EXTENSION:
+        relative_path = root + ".html"
+    return os.path.join(dest_dir, relative_path)
+
+def plan_pages(content_dir, dest_dir):
+    # markdown files become pages, anything else in content_dir is copied next to them
+    plan = []
+    for path, size, mtime_ns in scan(content_dir):
+        kind = PAGE if path.endswith(PAGE_EXTENSION) else ASSET
+        plan.append((path, get_destination(path, content_dir, dest_dir), kind, size, mtime_ns))
+    plan.sort()
+    return plan
+
+def plan_assets(static_dir, dest_dir):
+    # static files are copied as they are, a .md file in static_dir is not a page
+    plan = []
+    if os.path.isdir(static_dir):
+        for path, size, mtime_ns in scan(static_dir):
+            plan.append((path, os.path.join(dest_dir, os.path.relpath(path, static_dir)), ASSET, size, mtime_ns))
+    plan.sort()
+    return plan
+
+def build_plan(content_dir, static_dir, dest_dir):
+    # every file of the site as (source, destination, kind, size, mtime_ns), sorted by source
+    return sorted(plan_assets(static_dir, dest_dir) + plan_pages(content_dir, dest_dir))
+
+def select(plan, kind):
+    return [entry for entry in plan if entry[2] == kind]
@@ -0,0 +1,70 @@
+import re
+
+DELIMITER = "---"
+DELIMITER_PATTERN = re.compile(r"^---[ \t]*\r?$", re.MULTILINE)
+KEY_PATTERN = re.compile(r"^([A-Za-z_][\w-]*)[ \t]*:(.*)$")
+ITEM_PATTERN = re.compile(r"^[ \t]*- (.*)$")
+INTEGER_PATTERN = re.compile(r"^-?\d+$")
+BOOLEANS = {"true": True, "yes": True, "on": True, "false": False, "no": False, "off": False}
+
+
+def parse_value(text):
+    text = text.strip()
+    if len(text) >= 2 and text[0] in "\"'" and text[-1] == text[0]:
+        return text[1:-1]
+    if text.startswith("[") and text.endswith("]"):
+        return [parse_value(item) for item in text[1:-1].split(",") if item.strip() != ""]
+    if text.lower() in BOOLEANS:
+        return BOOLEANS[text.lower()]
+    if INTEGER_PATTERN.match(text):
+        return int(text)
+    return text
+
+def parse_front_matter(lines):
+    # the YAML subset pages need: "key: value" scalars, [inline, lists] and "- item" block lists
+    metadata = {}
+    key = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line.strip() == "" or line.lstrip().startswith("#"):
+            continue
+        item = ITEM_PATTERN.match(line)
+        if item is not None and key is not None:
+            if not isinstance(metadata[key], list):
+                metadata[key] = []
+            metadata[key].append(parse_value(item.group(1)))
+            continue
+        match = KEY_PATTERN.match(line)
+        if match is None:
+            raise Exception(f"Invalid front matter line: {line}")
+        key = match.group(1)
+        metadata[key] = parse_value(match.group(2)) if match.group(2).strip() != "" else None
+    return metadata
+
+def split_front_matter(markdown):
+    # returns (metadata, body), markdown without front matter is all body
+    if not markdown.startswith(DELIMITER) or DELIMITER_PATTERN.match(markdown) is None:
+        return {}, markdown
+    start = markdown.find("\n") + 1
+    if start == 0:
+        raise Exception("Front matter is not closed")
+    end = DELIMITER_PATTERN.search(markdown, start)
+    if end is None:
+        raise Exception("Front matter is not closed")
+    return parse_front_matter(markdown[start:end.start()].split("\n")), markdown[end.end() + 1:]
+
+def read_front_matter(file):
+    # reads the front matter at the current position of a text file and leaves the file at the
+    # first line of the body, so only the head of the file is read
+    start = file.tell()
+    if DELIMITER_PATTERN.match(file.readline().rstrip("\n")) is None:
+        file.seek(start)
+        return {}
+    lines = []
+    while True:
+        line = file.readline()
+        if line == "":
+            raise Exception("Front matter is not closed")
+        if DELIMITER_PATTERN.match(line.rstrip("\n")) is not None:
+            return parse_front_matter(lines)
+        lines.append(line)
@@ -1,47 +1,293 @@
 import os
-from converter import markdown_to_html_node
+from concurrent.futures import ThreadPoolExecutor
 
-TITLE_PLACEHOLDER = "{{ Title }}"
-CONTENT_PLACEHOLDER = "{{ Content }}"
+import converter
+from converter import blocks_to_html_node, collect_references, converter_version, hit_rate, init_inline_cache, inline_cache_counts, \
+    iter_block_nodes, parse_blocks
+from discovery import PAGE, plan_pages, select
+from frontmatter import read_front_matter, split_front_matter
+from manifest import Manifest, hash_file
+from output import AtomicFile, write_file
+from pipeline import BoundedWriter, prefetch
+from profiler import NULL_PROFILER
+from template import annotate_images, load_template, rebase_urls
+from workers import resolve_jobs, run_jobs
+
+# sources larger than this are streamed block by block instead of being read into memory
+STREAM_THRESHOLD = 4 * 1024 * 1024
+# sources read ahead of rendering and rendered pages waiting to be written, per stage
+PIPELINE_DEPTH = 16
+
+class StreamedContent:
+    def __init__(self, lines, base_path, images = None):
+        self.lines = lines
+        self.base_path = base_path
+        self.images = images
+
+    def render(self, write):
+        write("<div>")
+        for html_node in iter_block_nodes(self.lines):
+            if self.images:
+                annotate_images(html_node, self.images, self.base_path)
+            rebase_urls(html_node, self.base_path)
+            html_node.render(write)
+        write("</div>")
 
 def extract_title(markdown):
-    lines = markdown.split("\n")
+    return find_title(markdown.split("\n"))
+
+def find_title(lines):
     for line in lines:
         if line.startswith("# "):
             return line.replace("# ", "", 1).strip()
     raise Exception("Markdown has no title")
 
-def generate_page(from_path, template_path, dest_path, base_path):
+def page_title(metadata, lines):
+    # a title in the front matter wins over the first heading
+    title = metadata.get("title")
+    if title is not None:
+        return str(title)
+    return find_title(lines)
+
+def read_page_meta(path):
+    # only the front matter and the lines up to the title are read, the body is not parsed
+    with open(path) as file:
+        metadata = read_front_matter(file)
+        title = page_title(metadata, file)
+    return page_meta(metadata, title)
+
+def page_meta(metadata, title):
+    tags = metadata.get("tags")
+    if tags is None:
+        tags = []
+    elif not isinstance(tags, list):
+        tags = [tags]
+    date = metadata.get("date")
+    return {
+        "title": title,
+        "date": str(date) if date is not None else None,
+        "tags": [str(tag) for tag in tags],
+        "draft": metadata.get("draft") is True
+    }
+
+def generate_page(from_path, template_path, dest_path, base_path, profiler = NULL_PROFILER, cache = None, images = None):
     print(f"Generating page from {from_path} to {dest_path} using {template_path}")
-    from_file = open(from_path)
-    markdown = from_file.read()
-    template_file = open(template_path)
-    template = template_file.read()
-    
-    title = extract_title(markdown)
-    html_node = markdown_to_html_node(markdown)
-    content = html_node.to_html()
-    html = template.replace(TITLE_PLACEHOLDER, title) \
-    .replace(CONTENT_PLACEHOLDER, content) \
-    .replace("href=\"/", f"href=\"{base_path}") \
-    .replace("src=\"/", f"src=\"{base_path}")
-    
-    dest_dir = os.path.dirname(dest_path)
-    os.makedirs(dest_dir, exist_ok = True)
-    dest_file = open(dest_path, 'w')
-    dest_file.write(html)
-
-    dest_file.close()
-    template_file.close()
-    from_file.close()
-
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, base_path):
-    children = os.listdir(dir_path_content)
-    for child in children:
-        path = os.path.join(dir_path_content, child)
-        path_without_root = path.split(os.path.sep, 1)[1]
-        destination = os.path.join(dest_dir_path, path_without_root)
-        if os.path.isfile(path):
-            generate_page(path, template_path, destination.replace(".md", ".html"), base_path)
+    if os.path.getsize(from_path) > STREAM_THRESHOLD:
+        return generate_page_streamed(from_path, template_path, dest_path, base_path, images)
+    with profiler.phase("file read"):
+        with open(from_path) as from_file:
+            markdown = from_file.read()
+    html, references = render_page(markdown, template_path, base_path, profiler, cache, images)
+    with profiler.phase("write"):
+        return write_file(dest_path, html), references
+
+def render_page(markdown, template_path, base_path, profiler = NULL_PROFILER, cache = None, images = None):
+    template = load_template(template_path, base_path)
+    title, content, references = render_markdown(markdown, base_path, profiler, cache, images)
+    with profiler.phase("template fill"):
+        return template.render({"Title": title, "Content": content}), references
+
+def render_markdown(markdown, base_path, profiler = NULL_PROFILER, cache = None, images = None):
+    cached = None
+    if cache is not None:
+        with profiler.phase("cache read"):
+            cached = cache.get(markdown)
+    if cached is not None:
+        title, html_node, references = cached
+    else:
+        with profiler.phase("title extraction"):
+            metadata, body = split_front_matter(markdown)
+            title = page_title(metadata, body.split("\n"))
+        with profiler.phase("block parse"):
+            blocks = parse_blocks(body)
+        with profiler.phase("inline parse"):
+            with collect_references() as references:
+                html_node = blocks_to_html_node(blocks)
+        if cache is not None:
+            with profiler.phase("cache write"):
+                cache.put(markdown, title, html_node, references)
+    # image sizes are applied after the cache so a resized image never needs the page parsed again
+    if images:
+        annotate_images(html_node, images, base_path)
+    rebase_urls(html_node, base_path)
+    with profiler.phase("html render"):
+        content = html_node.to_html()
+    return title, content, references
+
+def write_page(template, title, content, dest_path, profiler = NULL_PROFILER):
+    with profiler.phase("template fill"):
+        html = template.render({"Title": title, "Content": content})
+    with profiler.phase("write"):
+        return write_file(dest_path, html)
+
+def generate_page_streamed(from_path, template_path, dest_path, base_path, images = None):
+    template = load_template(template_path, base_path)
+    with open(from_path) as from_file:
+        metadata = read_front_matter(from_file)
+        body_start = from_file.tell()
+        title = page_title(metadata, from_file)
+        from_file.seek(body_start)
+        with AtomicFile(dest_path) as dest_file, collect_references() as references:
+            content = StreamedContent(from_file, base_path, images)
+            template.render_to(dest_file.write, {"Title": title, "Content": content})
+    return dest_file.written, references
+
+def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, base_path, incremental = False, jobs = 1,
+    profiler = None, cache = None, io_threads = 0, images = None, plan = None, drafts = False):
+    # plan is the build plan of discovery.build_plan(), only its pages are generated here, pages
+    # with "draft: true" in their front matter are left out unless drafts is set
+    pages = select(plan if plan is not None else plan_pages(dir_path_content, dest_dir_path), PAGE)
+    # the previous manifest is loaded in a full build too, so pages removed since then are deleted
+    previous = Manifest.load(dest_dir_path)
+    manifest = Manifest(hash_file(template_path), base_path, images = images or {}, converter_version = converter_version())
+    rebuild_all = not incremental or previous.template_hash != manifest.template_hash or previous.base_path != base_path \
+    or previous.converter_version != manifest.converter_version
+    stale = []
+    excluded = 0
+    for path, destination, _, size, mtime_ns in pages:
+        previous_entry = previous.pages.get(path)
+        # a source with the size and mtime of the last build is not read again to hash it or to get its metadata
+        if previous_entry is not None and previous_entry.get("size") == size and previous_entry.get("mtime_ns") == mtime_ns \
+        and "meta" in previous_entry:
+            source_hash = previous_entry["hash"]
+            meta = previous_entry["meta"]
         else:
-            generate_pages_recursive(path, template_path, dest_dir_path, base_path)
\ No newline at end of file
+            source_hash = hash_file(path)
+            try:
+                meta = read_page_meta(path)
+            except Exception as e:
+                raise Exception(f"Failed to read page metadata from {path}: {e}") from e
+        if meta["draft"] and not drafts:
+            excluded += 1
+            continue
+        entry = {"hash": source_hash, "dest": destination, "size": size, "mtime_ns": mtime_ns, "meta": meta}
+        manifest.pages[path] = entry
+        if not rebuild_all and previous.is_page_current(path, source_hash, destination) \
+        and not images_changed(previous_entry, previous.images, manifest.images):
+            entry["links"] = previous_entry.get("links", [])
+            entry["images"] = previous_entry.get("images", [])
+            continue
+        stale.append((path, destination, size))
+    if jobs != 1:
+        # the largest pages go first so no worker is left with a big one at the end
+        stale.sort(key = lambda page: page[2], reverse = True)
+    page_jobs = [(path, template_path, destination, base_path, cache, images) for path, destination, _ in stale]
+    if profiler is not None:
+        results = []
+        for page_job in page_jobs:
+            with profiler.page(page_job[0]):
+                results.append(generate_page_job(page_job, profiler))
+        written, page_references, inline_counts = sum_results(results)
+    else:
+        written, page_references, inline_counts = run_page_jobs(page_jobs, jobs, io_threads)
+    for page_job, references in zip(page_jobs, page_references):
+        manifest.pages[page_job[0]].update(references)
+    removed = remove_stale_pages(previous, manifest, dest_dir_path)
+    manifest.save(dest_dir_path)
+    if cache is not None:
+        cache.prune()
+    print(f"Generated {len(page_jobs)} pages ({written} written, {len(page_jobs) - written} identical on disk), "
+        f"skipped {len(pages) - len(page_jobs) - excluded} unchanged, removed {removed} stale, excluded {excluded} drafts")
+    if converter.inline_cache is not None:
+        hits, misses = inline_counts
+        print(f"Inline cache: {hits} hits, {misses} misses ({hit_rate(hits, misses):.1%} hit rate)")
+    return manifest
+
+def images_changed(entry, previous_images, images):
+    # a page embedding an image that was resized, replaced or removed needs new width, height and srcset
+    return any(previous_images.get(url) != images.get(url) for url in entry.get("images", []))
+
+def run_page_jobs(page_jobs, jobs, io_threads = 0):
+    # returns the number of pages written, the references of each page in job order and the inline cache counts,
+    # the inline cache entries added by worker processes are merged into the cache of this one
+    if (resolve_jobs(jobs) <= 1 or len(page_jobs) <= 1) and io_threads > 0:
+        return run_page_pipeline(page_jobs, io_threads)
+    initializer, initargs = None, ()
+    if converter.inline_cache is not None:
+        # each worker keeps its own inline cache for all the pages it renders, warmed with the entries of this
+        # one, which main loads from the last build
+        initializer = init_inline_cache
+        initargs = (converter.inline_cache.max_entries, converter.inline_cache.snapshot())
+    results = run_jobs(generate_page_job, page_jobs, jobs, initializer, initargs)
+    if converter.inline_cache is not None:
+        for _, _, (_, _, added) in results:
+            converter.inline_cache.warm(added)
+    return sum_results(results)
+
+def sum_results(results):
+    # returns the pages written, the references of each page and the inline cache (hits, misses)
+    written = 0
+    page_references = []
+    hits = misses = 0
+    for page_written, references, (page_hits, page_misses, _) in results:
+        written += page_written
+        page_references.append(references)
+        hits += page_hits
+        misses += page_misses
+    return written, page_references, (hits, misses)
+
+def generate_page_job(page_job, profiler = NULL_PROFILER):
+    from_path, template_path, dest_path, base_path, cache, images = page_job
+    hits, misses = inline_cache_counts()
+    try:
+        written, references = generate_page(from_path, template_path, dest_path, base_path, profiler, cache, images)
+    except Exception as e:
+        raise Exception(f"Failed to generate page from {from_path}: {e}") from e
+    # the counts of this page alone, so the ones of worker processes can be summed up
+    page_hits, page_misses = inline_cache_counts()
+    added = converter.inline_cache.take_added() if converter.inline_cache is not None else []
+    return written, references, (page_hits - hits, page_misses - misses, added)
+
+def run_page_pipeline(page_jobs, io_threads):
+    # sources are read ahead and pages written behind in io_threads threads while this thread renders,
+    # so file system latency overlaps with parsing instead of adding to it
+    streamed = 0
+    page_references = []
+    hits, misses = inline_cache_counts()
+    with ThreadPoolExecutor(max_workers = io_threads) as executor:
+        writer = BoundedWriter(executor, write_file, PIPELINE_DEPTH)
+        for page_job, markdown in prefetch(executor, read_page_source, page_jobs, PIPELINE_DEPTH):
+            if markdown is None:
+                written, references, _ = generate_page_job(page_job)
+                streamed += written
+                page_references.append(references)
+                continue
+            from_path, template_path, dest_path, base_path, cache, images = page_job
+            print(f"Generating page from {from_path} to {dest_path} using {template_path}")
+            try:
+                html, references = render_page(markdown, template_path, base_path, cache = cache, images = images)
+            except Exception as e:
+                raise Exception(f"Failed to generate page from {from_path}: {e}") from e
+            writer.submit(dest_path, html)
+            page_references.append(references)
+        written = writer.flush() + streamed
+    end_hits, end_misses = inline_cache_counts()
+    return written, page_references, (end_hits - hits, end_misses - misses)
+
+def read_page_source(page_job):
+    from_path = page_job[0]
+    if os.path.getsize(from_path) > STREAM_THRESHOLD:
+        return None
+    with open(from_path) as from_file:
+        return from_file.read()
+
+def remove_stale_pages(previous, manifest, dest_dir_path):
+    current_destinations = set(entry["dest"] for entry in manifest.pages.values())
+    removed = 0
+    for path, entry in previous.pages.items():
+        destination = entry["dest"]
+        if path in manifest.pages or destination in current_destinations:
+            continue
+        if os.path.isfile(destination):
+            print(f"Removing stale page {destination}")
+            os.remove(destination)
+            removed += 1
+        remove_empty_dirs(os.path.dirname(destination), dest_dir_path)
+    return removed
+
+def remove_empty_dirs(dir_path, root):
+    root = os.path.abspath(root)
+    while os.path.abspath(dir_path).startswith(root + os.path.sep) \
+    and os.path.isdir(dir_path) and len(os.listdir(dir_path)) == 0:
+        os.rmdir(dir_path)
+        dir_path = os.path.dirname(dir_path)
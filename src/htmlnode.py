@@ -1,4 +1,7 @@
 class HTMLNode:
+    # slots keep every node free of a per-instance __dict__, leaves and parents add no slots of their own
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag = None, value = None, children = None, props = None):
         self.tag = tag
         self.value = value
@@ -8,6 +11,12 @@ class HTMLNode:
     def to_html(self):
         raise NotImplementedError()
 
+    def render(self, write):
+        write(self.to_html())
+
+    def write_html(self, fp):
+        self.render(fp.write)
+
     def props_to_html(self):
         if self.props is None:
             return ""
@@ -20,8 +29,13 @@ class HTMLNode:
         return f"HTMLNode(tag={self.tag}, value={self.value}, children={self.children}, props={self.props})"
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, value, props = None):
-        super().__init__(tag = tag, value = value, children = None, props = props)
+        self.tag = tag
+        self.value = value
+        self.children = None
+        self.props = props
 
     def to_html(self):
         if self.value is None:
@@ -30,17 +44,31 @@ class LeafNode(HTMLNode):
             return self.value
         return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
 
+    def render(self, write):
+        write(self.to_html())
+
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props = None):
-        super().__init__(tag = tag, value = None, children = children, props = props)
+        self.tag = tag
+        self.value = None
+        self.children = children
+        self.props = props
 
     def to_html(self):
+        parts = []
+        self.render(parts.append)
+        return "".join(parts)
+
+    def render(self, write):
+        # every node writes its fragments into the same sink, so the tree is rendered
+        # in one traversal without copying subtrees into intermediate strings
         if self.tag is None:
             raise ValueError("All parent nodes must have a tag.")
         if self.children is None:
             raise ValueError("All parent nodes must have children.")
-        html = f"<{self.tag}>"
+        write(f"<{self.tag}{self.props_to_html()}>")
         for child in self.children:
-            html += child.to_html()
-        html += f"</{self.tag}>"
-        return html
\ No newline at end of file
+            child.render(write)
+        write(f"</{self.tag}>")
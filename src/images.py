@@ -0,0 +1,182 @@
+import os
+import struct
+
+from assets import same_metadata, transfer
+from discovery import plan_assets
+from generator import remove_empty_dirs
+from manifest import hash_file
+from records import load_records, save_records
+from workers import run_jobs
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+IMAGES_FILE = ".images.json"
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp")
+DEFAULT_WIDTHS = (480, 960, 1440)
+JPEG_QUALITY = 82
+
+
+def read_dimensions(path):
+    # only the header is read, which is all it takes for the formats a site usually serves
+    with open(path, "rb") as file:
+        head = file.read(32)
+        if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+            return struct.unpack(">II", head[16:24])
+        if head[:6] in (b"GIF87a", b"GIF89a"):
+            return struct.unpack("<HH", head[6:10])
+        if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+            return webp_dimensions(head)
+        if head.startswith(b"\xff\xd8"):
+            file.seek(2)
+            return jpeg_dimensions(file)
+    if Image is not None:
+        with Image.open(path) as image:
+            return image.size
+    return None
+
+def webp_dimensions(head):
+    chunk = head[12:16]
+    if chunk == b"VP8X":
+        width = int.from_bytes(head[24:27], "little") + 1
+        height = int.from_bytes(head[27:30], "little") + 1
+        return width, height
+    if chunk == b"VP8L":
+        bits = int.from_bytes(head[21:25], "little")
+        return (bits & 0x3fff) + 1, ((bits >> 14) & 0x3fff) + 1
+    if chunk == b"VP8 ":
+        width, height = struct.unpack("<HH", head[26:30])
+        return width & 0x3fff, height & 0x3fff
+    return None
+
+def jpeg_dimensions(file):
+    while True:
+        marker = file.read(2)
+        if len(marker) < 2 or marker[0] != 0xff:
+            return None
+        if marker[1] in (0xd8, 0x01) or 0xd0 <= marker[1] <= 0xd7:
+            continue
+        length = struct.unpack(">H", file.read(2))[0]
+        # start of frame markers, except the DHT, JPG and DAC ones that share the range
+        if 0xc0 <= marker[1] <= 0xcf and marker[1] not in (0xc4, 0xc8, 0xcc):
+            height, width = struct.unpack(">xHH", file.read(5))
+            return width, height
+        file.seek(length - 2, os.SEEK_CUR)
+
+def variant_name(relative_path, width):
+    stem, extension = os.path.splitext(relative_path)
+    return f"{stem}-{width}w{extension}"
+
+def derivative_path(cache_dir, source_hash, width, extension):
+    return os.path.join(cache_dir, source_hash[:2], f"{source_hash}-{width}{extension.lower()}")
+
+def process_image(image_job):
+    # runs in a worker: reads the dimensions and makes every missing derivative in the cache,
+    # derivatives are keyed by the hash of the source so each one is produced once
+    path, source_hash, widths, cache_dir = image_job
+    dimensions = read_dimensions(path)
+    if dimensions is None:
+        return None, []
+    width, height = dimensions
+    extension = os.path.splitext(path)[1]
+    derivatives = []
+    for variant_width in sorted(set(widths)):
+        if variant_width >= width:
+            continue
+        derivative = derivative_path(cache_dir, source_hash, variant_width, extension)
+        if not os.path.isfile(derivative):
+            if Image is None:
+                continue
+            resize(path, derivative, variant_width)
+        derivatives.append((variant_width, derivative))
+    return (width, height), derivatives
+
+def resize(path, derivative, width):
+    os.makedirs(os.path.dirname(derivative), exist_ok = True)
+    temp_path = f"{derivative}.{os.getpid()}.tmp"
+    with Image.open(path) as image:
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.LANCZOS)
+        if image.format == "JPEG":
+            resized.save(temp_path, "JPEG", quality = JPEG_QUALITY, optimize = True, progressive = True)
+        else:
+            resized.save(temp_path, image.format, optimize = True)
+    os.replace(temp_path, derivative)
+
+def is_current(previous_record, record, dest_dir):
+    return previous_record is not None \
+    and same_metadata(previous_record, record) \
+    and previous_record.get("widths") == record["widths"] \
+    and previous_record.get("pillow") == record["pillow"] \
+    and all(os.path.isfile(os.path.join(dest_dir, variant)) for variant, _ in previous_record["variants"])
+
+def process_images(source_dir, dest_dir, cache_dir, widths = DEFAULT_WIDTHS, jobs = 1, link = "copy", plan = None):
+    # returns {url: {"width", "height", "variants": [[url, width], ...]}} for every image in source_dir,
+    # or in the asset entries of plan when it is given
+    os.makedirs(dest_dir, exist_ok = True)
+    previous = load_records(dest_dir, IMAGES_FILE)
+    records = {}
+    image_jobs = []
+    if plan is None:
+        plan = plan_assets(source_dir, dest_dir)
+    for path, destination, _, size, mtime_ns in plan:
+        if not path.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        relative_path = os.path.relpath(destination, dest_dir)
+        # installing or removing Pillow changes which variants can be made
+        record = {"size": size, "mtime_ns": mtime_ns, "widths": sorted(set(widths)), "pillow": Image is not None}
+        previous_record = previous.get(relative_path)
+        if is_current(previous_record, record, dest_dir):
+            records[relative_path] = previous_record
+            continue
+        records[relative_path] = record
+        image_jobs.append((relative_path, (path, hash_file(path), widths, cache_dir)))
+    if Image is None and len(image_jobs) > 0 and len(widths) > 0:
+        print("Pillow is not installed, images get width and height but no resized variants")
+    for (relative_path, _), (dimensions, derivatives) in zip(image_jobs, run_image_jobs(image_jobs, jobs)):
+        record = records[relative_path]
+        record["dimensions"] = dimensions
+        record["variants"] = []
+        for variant_width, derivative in derivatives:
+            variant = variant_name(relative_path, variant_width)
+            destination = os.path.join(dest_dir, variant)
+            os.makedirs(os.path.dirname(destination), exist_ok = True)
+            transfer(derivative, destination, link)
+            record["variants"].append([variant, variant_width])
+    removed = remove_stale_variants(previous, records, dest_dir)
+    save_records(dest_dir, IMAGES_FILE, records)
+    print(f"Processed {len(image_jobs)} images, skipped {len(records) - len(image_jobs)} unchanged, "
+        f"removed {removed} stale variants")
+    return image_info(records)
+
+def run_image_jobs(image_jobs, jobs):
+    return run_jobs(process_image, [image_job for _, image_job in image_jobs], jobs)
+
+def remove_stale_variants(previous, records, dest_dir):
+    current = set(variant for record in records.values() for variant, _ in record["variants"])
+    removed = 0
+    for record in previous.values():
+        for variant, _ in record.get("variants", []):
+            if variant in current:
+                continue
+            destination = os.path.join(dest_dir, variant)
+            if os.path.isfile(destination):
+                os.remove(destination)
+                removed += 1
+            remove_empty_dirs(os.path.dirname(destination), dest_dir)
+    return removed
+
+def image_info(records):
+    images = {}
+    for relative_path, record in records.items():
+        if record["dimensions"] is None:
+            continue
+        width, height = record["dimensions"]
+        images["/" + relative_path.replace(os.path.sep, "/")] = {
+            "width": width,
+            "height": height,
+            "variants": [["/" + variant.replace(os.path.sep, "/"), variant_width] for variant, variant_width in record["variants"]]
+        }
+    return images
@@ -0,0 +1,87 @@
+import os
+from urllib.parse import urljoin, urlsplit
+
+from assets import find_assets
+from discovery import ASSET, select
+
+
+def page_url(dest_path, dest_dir_path):
+    url = "/" + os.path.relpath(dest_path, dest_dir_path).replace(os.path.sep, "/")
+    if url.endswith("/index.html"):
+        return url[:-len("index.html")]
+    return url
+
+def normalize_url(url):
+    # "/blog/tom", "/blog/tom/" and "/blog/tom/index.html" all name the same page
+    if url.endswith("/index.html"):
+        url = url[:-len("index.html")]
+    if len(url) > 1 and url.endswith("/"):
+        url = url[:-1]
+    return url
+
+def resolve_url(url, base_url):
+    # returns the site path a reference points to, or None for external and same page urls
+    parts = urlsplit(url)
+    if parts.scheme != "" or parts.netloc != "" or parts.path == "":
+        return None
+    return normalize_url(urljoin(base_url, parts.path))
+
+class LinkIndex:
+    def __init__(self):
+        self.pages = {}
+        self.assets = set()
+        self.references = {}
+        self.referrers = {}
+
+    @classmethod
+    def from_manifest(cls, manifest, dest_dir_path, static_dir = None, plan = None):
+        # assets are taken from the build plan when there is one, static_dir is scanned otherwise
+        index = cls()
+        for source, entry in manifest.pages.items():
+            index.pages[normalize_url(page_url(entry["dest"], dest_dir_path))] = source
+        if plan is not None:
+            for _, destination, _, _, _ in select(plan, ASSET):
+                index.assets.add("/" + os.path.relpath(destination, dest_dir_path).replace(os.path.sep, "/"))
+        elif static_dir is not None and os.path.isdir(static_dir):
+            for relative_path, _ in find_assets(static_dir):
+                index.assets.add("/" + relative_path.replace(os.path.sep, "/"))
+        for source, entry in manifest.pages.items():
+            index.add_page(source, page_url(entry["dest"], dest_dir_path), entry.get("links", []), entry.get("images", []))
+        return index
+
+    def add_target(self, url, source):
+        # a page that is not in the manifest, such as a generated listing
+        self.pages[normalize_url(url)] = source
+
+    def add_page(self, source, url, links, images):
+        references = []
+        for kind, urls in (("link", links), ("image", images)):
+            for reference in urls:
+                target = resolve_url(reference, url)
+                if target is None:
+                    continue
+                references.append((kind, reference, target))
+                self.referrers.setdefault(target, set()).add(source)
+        self.references[source] = references
+
+    def broken_references(self):
+        # links may point at pages or assets, images only at assets
+        broken = []
+        for source in sorted(self.references):
+            for kind, reference, target in self.references[source]:
+                if target in self.assets or (kind == "link" and target in self.pages):
+                    continue
+                broken.append((source, kind, reference))
+        return broken
+
+    def pages_referencing(self, url):
+        return sorted(self.referrers.get(normalize_url(url), ()))
+
+    def report(self):
+        broken = self.broken_references()
+        if len(broken) == 0:
+            return f"Checked links and images of {len(self.references)} pages, no broken references"
+        lines = [f"Found {len(broken)} broken references in {len(self.references)} pages:"]
+        for source, kind, reference in broken:
+            lines.append(f"  {source}: {kind} {reference}")
+        return "\n".join(lines)
@@ -0,0 +1,214 @@
+import hashlib
+import json
+import os
+import re
+from datetime import datetime, timezone
+from xml.sax.saxutils import escape, quoteattr
+
+from generator import remove_empty_dirs
+from htmlnode import LeafNode, ParentNode
+from manifest import hash_file
+from records import load_records, save_records
+from output import write_file
+from pageindex import PageIndex
+from template import load_template, rebase_url, rebase_urls
+
+LISTINGS_FILE = ".listings.json"
+BLOG_PATH = "/blog/"
+PAGE_SIZE = 10
+FEED_SIZE = 20
+FEED_FILE = "atom.xml"
+SITEMAP_FILE = "sitemap.xml"
+SLUG_PATTERN = re.compile(r"[^a-z0-9]+")
+
+
+def slugify(text):
+    return SLUG_PATTERN.sub("-", text.lower()).strip("-")
+
+def tag_slugs(tags):
+    # distinct tags always get distinct urls, tags whose slugs collide, such as "C", "C++" and "C#",
+    # and tags without a single ascii letter or digit get a hash of the tag in their slug
+    groups = {}
+    for tag in tags:
+        groups.setdefault(slugify(tag), []).append(tag)
+    slugs = {}
+    for slug, group in groups.items():
+        for tag in group:
+            if len(group) == 1 and slug != "":
+                slugs[tag] = slug
+                continue
+            digest = hashlib.sha256(tag.encode()).hexdigest()[:8]
+            slugs[tag] = f"{slug}-{digest}" if slug != "" else digest
+    return slugs
+
+def updated(page):
+    # the date of the front matter, or the mtime of the source for undated pages
+    if page["date"] is not None:
+        date = page["date"]
+        return f"{date}T00:00:00Z" if len(date) == 10 else date
+    if page.get("mtime_ns") is not None:
+        return datetime.fromtimestamp(page["mtime_ns"] / 1e9, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return "1970-01-01T00:00:00Z"
+
+def paginate(pages, page_size):
+    chunks = [pages[start:start + page_size] for start in range(0, len(pages), page_size)]
+    return chunks if len(chunks) > 0 else [[]]
+
+def page_path(section_path, number):
+    return section_path if number == 1 else f"{section_path}page/{number}/"
+
+def summary(page):
+    # the fields a listing shows, a page whose summary is unchanged does not make its listing stale
+    return [page["path"], page["title"], page["date"], page["tags"]]
+
+def plan_listings(index, blog_path = BLOG_PATH, page_size = PAGE_SIZE, site_url = None):
+    # returns {url: (kind, data)} for every generated artifact, data is everything it is rendered from
+    posts = index.section(blog_path)
+    if len(posts) == 0:
+        return {}
+    artifacts = {}
+    sections = [(blog_path, "Blog", posts)]
+    by_tag = index.by_tag(posts)
+    slugs = tag_slugs(by_tag)
+    for tag, tagged in by_tag.items():
+        sections.append((f"{blog_path}tags/{slugs[tag]}/", f"Posts tagged \"{tag}\"", tagged))
+    tags = [[tag, f"{blog_path}tags/{slugs[tag]}/"] for tag in by_tag]
+    for section_path, title, pages in sections:
+        chunks = paginate(pages, page_size)
+        for number, chunk in enumerate(chunks, 1):
+            artifacts[page_path(section_path, number)] = ("listing", {
+                "title": title if number == 1 else f"{title}, page {number}",
+                "pages": [summary(page) for page in chunk],
+                "previous": page_path(section_path, number - 1) if number > 1 else None,
+                "next": page_path(section_path, number + 1) if number < len(chunks) else None,
+                "tags": tags if section_path == blog_path and number == 1 else []
+            })
+    if site_url is not None:
+        home = index.find("/")
+        artifacts[blog_path + FEED_FILE] = ("feed", {
+            "title": home["title"] if home is not None else "Blog",
+            "blog": blog_path,
+            "entries": [summary(page) + [updated(page)] for page in posts[:FEED_SIZE]]
+        })
+        listed = [[page["path"], updated(page)] for page in index.published()]
+        listed += [[url, None] for url, (kind, _) in artifacts.items() if kind == "listing"]
+        artifacts["/" + SITEMAP_FILE] = ("sitemap", {"urls": sorted(listed)})
+    return artifacts
+
+def listing_node(data):
+    children = [LeafNode("h1", data["title"])]
+    items = []
+    for path, title, date, _ in data["pages"]:
+        item = [LeafNode("a", title, {"href": path})]
+        if date is not None:
+            item.append(LeafNode(None, " "))
+            item.append(LeafNode("time", date, {"datetime": date}))
+        items.append(ParentNode("li", item))
+    if len(items) > 0:
+        children.append(ParentNode("ul", items))
+    if len(data["tags"]) > 0:
+        children.append(LeafNode("h2", "Tags"))
+        children.append(ParentNode("ul", [ParentNode("li", [LeafNode("a", tag, {"href": path})]) for tag, path in data["tags"]]))
+    links = []
+    if data["previous"] is not None:
+        links.append(LeafNode("a", "Newer posts", {"href": data["previous"]}))
+    if data["next"] is not None:
+        if len(links) > 0:
+            links.append(LeafNode(None, " "))
+        links.append(LeafNode("a", "Older posts", {"href": data["next"]}))
+    if len(links) > 0:
+        children.append(ParentNode("p", links))
+    return ParentNode("div", children)
+
+def render_listing(data, template, base_path):
+    html_node = listing_node(data)
+    rebase_urls(html_node, base_path)
+    return template.render({"Title": data["title"], "Content": html_node.to_html()})
+
+def absolute_url(site_url, path, base_path):
+    return site_url.rstrip("/") + rebase_url(path, base_path)
+
+def render_feed(url, data, site_url, base_path):
+    feed_url = absolute_url(site_url, url, base_path)
+    blog_url = absolute_url(site_url, data["blog"], base_path)
+    entries = data["entries"]
+    lines = [
+        "<?xml version=\"1.0\" encoding=\"utf-8\"?>",
+        "<feed xmlns=\"http://www.w3.org/2005/Atom\">",
+        f"  <title>{escape(data['title'])}</title>",
+        f"  <link href={quoteattr(feed_url)} rel=\"self\" />",
+        f"  <link href={quoteattr(blog_url)} />",
+        f"  <id>{escape(blog_url)}</id>",
+        f"  <updated>{max((entry[4] for entry in entries), default = '1970-01-01T00:00:00Z')}</updated>"
+    ]
+    for path, title, _, tags, entry_updated in entries:
+        entry_url = absolute_url(site_url, path, base_path)
+        lines.append("  <entry>")
+        lines.append(f"    <title>{escape(title)}</title>")
+        lines.append(f"    <link href={quoteattr(entry_url)} />")
+        lines.append(f"    <id>{escape(entry_url)}</id>")
+        lines.append(f"    <updated>{entry_updated}</updated>")
+        for tag in tags:
+            lines.append(f"    <category term={quoteattr(tag)} />")
+        lines.append("  </entry>")
+    lines.append("</feed>")
+    return "\n".join(lines) + "\n"
+
+def render_sitemap(data, site_url, base_path):
+    lines = [
+        "<?xml version=\"1.0\" encoding=\"utf-8\"?>",
+        "<urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\">"
+    ]
+    for path, url_updated in data["urls"]:
+        lines.append(f"  <url><loc>{escape(absolute_url(site_url, path, base_path))}</loc>"
+            + (f"<lastmod>{url_updated}</lastmod>" if url_updated is not None else "") + "</url>")
+    lines.append("</urlset>")
+    return "\n".join(lines) + "\n"
+
+def destination_of(url, dest_dir_path):
+    relative_path = url.strip("/").replace("/", os.path.sep)
+    if url.endswith("/"):
+        relative_path = os.path.join(relative_path, "index.html")
+    return os.path.join(dest_dir_path, relative_path)
+
+def generate_listings(manifest, template_path, dest_dir_path, base_path, site_url = None, blog_path = BLOG_PATH,
+    page_size = PAGE_SIZE):
+    # writes blog listings, tag pages, their archives, the Atom feed and the sitemap from the page index,
+    # an artifact is only rendered when the summaries it lists or the template changed
+    index = PageIndex.from_manifest(manifest, dest_dir_path)
+    artifacts = plan_listings(index, blog_path, page_size, site_url)
+    content_pages = set(entry["dest"] for entry in manifest.pages.values())
+    settings = [hash_file(template_path), base_path, site_url]
+    previous = load_records(dest_dir_path, LISTINGS_FILE)
+    records = {}
+    rendered = 0
+    for url, (kind, data) in artifacts.items():
+        destination = destination_of(url, dest_dir_path)
+        if destination in content_pages:
+            # a page written by hand wins over a generated one
+            continue
+        signature = hashlib.sha256(json.dumps([kind, data, settings]).encode()).hexdigest()
+        records[url] = signature
+        if previous.get(url) == signature and os.path.isfile(destination):
+            continue
+        if kind == "listing":
+            text = render_listing(data, load_template(template_path, base_path), base_path)
+        elif kind == "feed":
+            text = render_feed(url, data, site_url, base_path)
+        else:
+            text = render_sitemap(data, site_url, base_path)
+        write_file(destination, text)
+        rendered += 1
+    removed = 0
+    for url in previous:
+        if url in records:
+            continue
+        destination = destination_of(url, dest_dir_path)
+        if os.path.isfile(destination) and destination not in content_pages:
+            os.remove(destination)
+            removed += 1
+        remove_empty_dirs(os.path.dirname(destination), dest_dir_path)
+    save_records(dest_dir_path, LISTINGS_FILE, records)
+    print(f"Generated {rendered} listings, feeds and sitemaps, skipped {len(records) - rendered} unchanged, "
+        f"removed {removed} stale")
+    return sorted(records)
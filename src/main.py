@@ -1,43 +1,184 @@
+import argparse
+import cProfile
 import os
 import shutil
-import sys
+
+import converter
+from assets import COMPARE_MODES, LINK_MODES, sync
+from cache import DEFAULT_MAX_BYTES, ParseCache, load_inline_cache, save_inline_cache
+from converter import set_inline_cache
+from discovery import ASSET, build_plan, select
 from generator import generate_pages_recursive
+from images import DEFAULT_WIDTHS, process_images
+from linkindex import LinkIndex
+from listings import PAGE_SIZE, generate_listings
+from manifest import Manifest
+from postprocess import available_formats, postprocess, reset_postprocess
+from profiler import NULL_PROFILER, BuildProfiler
+from server import ReloadSignal, start_server
+from watcher import SiteWatcher
 
+CACHE = ".cache"
+INLINE_CACHE = os.path.join(CACHE, "inline.bin")
 CONTENT = "content"
 DOCS = "docs"
 STATIC = "static"
 TEMPLATE = "template.html"
 
+def parse_args():
+    parser = argparse.ArgumentParser(description = "Build the site from markdown content")
+    parser.add_argument("base_path", nargs = "?", default = "/", help = "path the site is served from")
+    parser.add_argument("--incremental", action = "store_true",
+        help = "only regenerate pages whose source, template or base path changed")
+    parser.add_argument("--clean", action = "store_true",
+        help = f"remove '{DOCS}' before the build, also dropping files that no earlier build wrote")
+    parser.add_argument("--asset-compare", choices = COMPARE_MODES, default = "mtime",
+        help = "how assets are compared with the previous build (default: mtime)")
+    parser.add_argument("--asset-link", choices = LINK_MODES, default = "copy",
+        help = "how assets are placed in the output, reflink and hardlink fall back to a copy (default: copy)")
+    parser.add_argument("--drafts", action = "store_true", help = "also build pages with \"draft: true\" in their front matter")
+    parser.add_argument("--jobs", type = int, default = 1, metavar = "N",
+        help = "render pages in N worker processes (0 uses every CPU)")
+    parser.add_argument("--image-widths", type = parse_widths, default = DEFAULT_WIDTHS, metavar = "W,W,...",
+        help = "widths of the resized image variants listed in srcset, empty for none (default: "
+        f"{','.join(str(width) for width in DEFAULT_WIDTHS)})")
+    parser.add_argument("--no-cache", action = "store_true", help = f"do not read or write parsed pages in '{CACHE}'")
+    parser.add_argument("--cache-size", type = int, default = DEFAULT_MAX_BYTES // (1024 * 1024), metavar = "MB",
+        help = "evict the least recently used parsed pages beyond this size (default: %(default)s)")
+    parser.add_argument("--inline-cache", type = int, default = 0, metavar = "N",
+        help = f"reuse the HTML of the N most recently seen inline strings, kept in '{CACHE}' between builds, "
+        "0 disables it (default: 0)")
+    parser.add_argument("--no-listings", action = "store_true",
+        help = "do not generate the blog index, tag pages and archives from the pages below /blog/")
+    parser.add_argument("--page-size", type = int, default = PAGE_SIZE, metavar = "N",
+        help = "posts per blog index, tag and archive page (default: %(default)s)")
+    parser.add_argument("--site-url", metavar = "URL",
+        help = "absolute URL of the site such as https://example.com, needed for the Atom feed and sitemap.xml")
+    parser.add_argument("--minify", action = "store_true", help = f"minify the HTML and CSS in '{DOCS}' after the build")
+    parser.add_argument("--precompress", action = "store_true",
+        help = "write .gz siblings, and .br ones when brotli is installed, next to every text file after the build")
+    parser.add_argument("--watch", action = "store_true",
+        help = f"serve '{DOCS}' and rebuild only what changes in '{CONTENT}', '{STATIC}' and '{TEMPLATE}'")
+    parser.add_argument("--port", type = int, default = 8888, help = "port of the --watch server (default: 8888)")
+    parser.add_argument("--interval", type = float, default = 0.05, metavar = "SECONDS",
+        help = "how often --watch polls for changes (default: 0.05)")
+    parser.add_argument("--io-threads", type = int, default = 4, metavar = "N",
+        help = "read sources and write pages in N threads while rendering, 0 disables it (default: 4)")
+    parser.add_argument("--find-references", metavar = "URL",
+        help = "list the pages of the last build that link to or embed URL instead of building")
+    parser.add_argument("--profile", type = int, nargs = "?", const = 10, metavar = "N",
+        help = "time and trace allocations for every build phase and list the N slowest pages (default 10)")
+    parser.add_argument("--profile-json", metavar = "PATH", help = "write the raw profiling data to a JSON file")
+    parser.add_argument("--profile-cprofile", metavar = "PATH", help = "write a cProfile dump of the build")
+    return parser.parse_args()
+
+def parse_widths(text):
+    try:
+        return tuple(int(width) for width in text.split(",") if width.strip() != "")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid width list: '{text}'")
+
 def main():
-    base_path = "/"
-    if len(sys.argv) > 1:
-        base_path = sys.argv[1]
+    args = parse_args()
+    if args.inline_cache > 0:
+        set_inline_cache(load_inline_cache(INLINE_CACHE, args.inline_cache))
+    if args.watch:
+        watch(args)
+        return
+    if args.find_references is not None:
+        find_references(args.find_references)
+        return
+    profiling = args.profile is not None or args.profile_json is not None or args.profile_cprofile is not None
+    if not profiling:
+        build(args)
+        return
+    if args.jobs != 1:
+        print("Profiling renders pages in a single process, ignoring --jobs")
+        args.jobs = 1
+    profiler = BuildProfiler()
+    profile = cProfile.Profile() if args.profile_cprofile is not None else None
+    profiler.start()
+    if profile is not None:
+        profile.enable()
+    try:
+        build(args, profiler)
+    finally:
+        if profile is not None:
+            profile.disable()
+        profiler.stop()
+    print(profiler.report(args.profile if args.profile is not None else 10))
+    if args.profile_json is not None:
+        profiler.save_json(args.profile_json)
+        print(f"Profiling data written to {args.profile_json}")
+    if profile is not None:
+        profile.dump_stats(args.profile_cprofile)
+        print(f"cProfile stats written to {args.profile_cprofile}")
+
+def build(args, profiler = None):
+    base_path = args.base_path
     print(f"Base path: {base_path}")
-    if os.path.exists(STATIC):
-        print(f"Copying assets from directory '{STATIC}' to directory '{DOCS}'")
-        if os.path.exists(DOCS):
-            print(f"Removing directory '{DOCS}'")
-            shutil.rmtree(DOCS)
+    with (profiler or NULL_PROFILER).phase("discovery"):
+        plan = build_plan(CONTENT, STATIC, DOCS)
+    assets = select(plan, ASSET)
+    if not os.path.exists(STATIC):
+        print(f"Directory '{STATIC}' does not exist")
+    print(f"Copying {len(assets)} assets from directories '{STATIC}' and '{CONTENT}' to directory '{DOCS}'")
+    with (profiler or NULL_PROFILER).phase("static copy"):
+        prepare_docs(args)
+        if not args.minify and not args.precompress:
+            reset_postprocess(DOCS)
+        sync(STATIC, DOCS, compare = args.asset_compare, link = args.asset_link, plan = assets)
+    with (profiler or NULL_PROFILER).phase("images"):
+        images = process_images(STATIC, DOCS, os.path.join(CACHE, "images"), args.image_widths, args.jobs,
+            link = args.asset_link, plan = assets)
+    cache = None if args.no_cache else ParseCache(os.path.join(CACHE, "pages"), args.cache_size * 1024 * 1024)
+    manifest = generate_pages_recursive(CONTENT, TEMPLATE, DOCS, base_path, incremental = args.incremental, jobs = args.jobs,
+        profiler = profiler, cache = cache, io_threads = args.io_threads, images = images, plan = plan, drafts = args.drafts)
+    if converter.inline_cache is not None:
+        save_inline_cache(converter.inline_cache, INLINE_CACHE)
+    link_index = LinkIndex.from_manifest(manifest, DOCS, plan = plan)
+    if not args.no_listings:
+        with (profiler or NULL_PROFILER).phase("listings"):
+            for url in generate_listings(manifest, TEMPLATE, DOCS, base_path, site_url = args.site_url, page_size = args.page_size):
+                link_index.add_target(url, "generated")
+    print(link_index.report())
+    if args.minify or args.precompress:
+        with (profiler or NULL_PROFILER).phase("post-process"):
+            postprocess(DOCS, minify = args.minify, formats = available_formats() if args.precompress else [], jobs = args.jobs)
+
+def find_references(url):
+    index = LinkIndex.from_manifest(Manifest.load(DOCS), DOCS, STATIC)
+    pages = index.pages_referencing(url)
+    print(f"{len(pages)} pages reference {url}")
+    for page in pages:
+        print(f"  {page}")
+
+def prepare_docs(args):
+    if os.path.exists(DOCS) and args.clean:
+        print(f"Removing directory '{DOCS}'")
+        shutil.rmtree(DOCS)
+    if not os.path.exists(DOCS):
         print(f"Creating directory '{DOCS}'")
         os.mkdir(DOCS)
-        copy(STATIC, DOCS)
-    else:
-        print(f"Directory '{STATIC}' does not exist")
-    generate_pages_recursive(CONTENT, TEMPLATE, DOCS, base_path)
-
-def copy(dir, destination_root):
-    children = os.listdir(dir)
-    for child in children:
-        path = os.path.join(dir, child)
-        path_without_root = path.split(os.path.sep, 1)[1]
-        destination = os.path.join(destination_root, path_without_root)
-        if os.path.isfile(path):
-            print(f"Copying {path} to {destination}")
-            shutil.copy(path, destination)
-        else:
-            if not os.path.exists(destination):
-                print(f"Creating directory '{destination}'")
-                os.mkdir(destination)
-            copy(path, DOCS)
-
-main()
+
+def watch(args):
+    print(f"Base path: {args.base_path}")
+    prepare_docs(args)
+    watcher = SiteWatcher(CONTENT, STATIC, TEMPLATE, DOCS, args.base_path, asset_link = args.asset_link,
+        image_cache_dir = os.path.join(CACHE, "images"), image_widths = args.image_widths, listings = not args.no_listings,
+        site_url = args.site_url, page_size = args.page_size)
+    watcher.build()
+    if converter.inline_cache is not None:
+        save_inline_cache(converter.inline_cache, INLINE_CACHE)
+    reload_signal = ReloadSignal()
+    server = start_server(DOCS, args.port, reload_signal)
+    print(f"Serving '{DOCS}' on http://localhost:{args.port}/ and watching for changes, press Ctrl+C to stop")
+    try:
+        watcher.run(args.interval, on_rebuild = reload_signal.notify)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
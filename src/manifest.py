@@ -0,0 +1,51 @@
+import hashlib
+import json
+import os
+
+MANIFEST_FILE = ".manifest.json"
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class Manifest:
+    def __init__(self, template_hash = None, base_path = None, pages = None, images = None, converter_version = None):
+        self.template_hash = template_hash
+        self.base_path = base_path
+        self.pages = pages if pages is not None else {}
+        self.images = images if images is not None else {}
+        # pages rendered by another converter version or with other custom renderers are out of date
+        self.converter_version = converter_version
+
+    @classmethod
+    def load(cls, dest_dir_path):
+        path = os.path.join(dest_dir_path, MANIFEST_FILE)
+        try:
+            with open(path) as file:
+                data = json.load(file)
+            return cls(data["template_hash"], data["base_path"], data["pages"], data.get("images"), data.get("converter_version"))
+        except (OSError, ValueError, KeyError, TypeError):
+            return cls()
+
+    def save(self, dest_dir_path):
+        os.makedirs(dest_dir_path, exist_ok = True)
+        path = os.path.join(dest_dir_path, MANIFEST_FILE)
+        with open(path, "w") as file:
+            json.dump({
+                "template_hash": self.template_hash,
+                "base_path": self.base_path,
+                "pages": self.pages,
+                "images": self.images,
+                "converter_version": self.converter_version
+            }, file, indent = 2, sort_keys = True)
+
+    def is_page_current(self, source, source_hash, dest_path):
+        entry = self.pages.get(source)
+        return entry is not None \
+        and entry["hash"] == source_hash \
+        and entry["dest"] == dest_path \
+        and os.path.isfile(dest_path)
@@ -0,0 +1,67 @@
+import filecmp
+import os
+
+ENCODING = "utf-8"
+
+
+def get_temp_path(path):
+    return f"{path}.{os.getpid()}.tmp"
+
+def is_unchanged(path, data):
+    try:
+        if os.stat(path).st_size != len(data):
+            return False
+        with open(path, "rb") as file:
+            return file.read() == data
+    except FileNotFoundError:
+        return False
+
+def write_file(path, text):
+    # returns whether the file was written, identical files keep their mtime so rsync and
+    # object storage syncs only pick up pages that really changed
+    data = text.encode(ENCODING)
+    if is_unchanged(path, data):
+        return False
+    os.makedirs(os.path.dirname(path) or ".", exist_ok = True)
+    temp_path = get_temp_path(path)
+    try:
+        with open(temp_path, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        remove_temp(temp_path)
+        raise
+    return True
+
+def remove_temp(temp_path):
+    try:
+        os.remove(temp_path)
+    except FileNotFoundError:
+        pass
+
+class AtomicFile:
+    def __init__(self, path):
+        self.path = path
+        self.temp_path = get_temp_path(path)
+        self.file = None
+        self.written = False
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok = True)
+        self.file = open(self.temp_path, "w", encoding = ENCODING)
+        return self
+
+    def write(self, text):
+        return self.file.write(text)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.file.close()
+        if exc_type is not None:
+            remove_temp(self.temp_path)
+            return False
+        if os.path.isfile(self.path) and filecmp.cmp(self.temp_path, self.path, shallow = False):
+            remove_temp(self.temp_path)
+            return False
+        os.replace(self.temp_path, self.path)
+        self.written = True
+        return False
@@ -0,0 +1,49 @@
+from linkindex import page_url
+from manifest import Manifest
+
+
+class PageIndex:
+    def __init__(self, pages = None):
+        # each page is a dict of source, path, mtime_ns, title, date, tags and draft
+        self.pages = pages if pages is not None else []
+
+    @classmethod
+    def from_manifest(cls, manifest, dest_dir_path):
+        pages = []
+        for source, entry in sorted(manifest.pages.items()):
+            meta = entry.get("meta")
+            if meta is None:
+                continue
+            pages.append({"source": source, "path": page_url(entry["dest"], dest_dir_path), "mtime_ns": entry.get("mtime_ns"), **meta})
+        return cls(pages)
+
+    @classmethod
+    def load(cls, dest_dir_path):
+        # the index is part of the manifest of the last build, no page is read to get it
+        return cls.from_manifest(Manifest.load(dest_dir_path), dest_dir_path)
+
+    def published(self):
+        return [page for page in self.pages if not page["draft"]]
+
+    def section(self, prefix):
+        # published pages below prefix, without the page at prefix itself, newest first
+        return newest_first([page for page in self.published() if page["path"].startswith(prefix) and page["path"] != prefix])
+
+    def by_tag(self, pages = None):
+        tags = {}
+        for page in newest_first(self.published()) if pages is None else pages:
+            for tag in page["tags"]:
+                tags.setdefault(tag, []).append(page)
+        return dict(sorted(tags.items()))
+
+    def find(self, path):
+        for page in self.pages:
+            if page["path"] == path:
+                return page
+        return None
+
+def newest_first(pages):
+    # undated pages come last, pages of the same day are ordered by title
+    pages = sorted(pages, key = lambda page: page["title"])
+    pages.sort(key = lambda page: page["date"] or "", reverse = True)
+    return pages
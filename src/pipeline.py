@@ -0,0 +1,34 @@
+from collections import deque
+
+
+def prefetch(executor, read, items, depth):
+    # yields (item, read(item)) in order while up to depth reads run ahead in the executor
+    pending = deque()
+    for item in items:
+        pending.append((item, executor.submit(read, item)))
+        if len(pending) >= depth:
+            item, future = pending.popleft()
+            yield item, future.result()
+    while pending:
+        item, future = pending.popleft()
+        yield item, future.result()
+
+class BoundedWriter:
+    def __init__(self, executor, write, depth):
+        self.executor = executor
+        self.write = write
+        self.depth = depth
+        self.pending = deque()
+        self.written = 0
+
+    def submit(self, *args):
+        # once depth writes are in flight the producer waits for the oldest one, which bounds
+        # the rendered output held in memory and surfaces write errors in order
+        self.pending.append(self.executor.submit(self.write, *args))
+        while len(self.pending) > self.depth:
+            self.written += self.pending.popleft().result()
+
+    def flush(self):
+        while self.pending:
+            self.written += self.pending.popleft().result()
+        return self.written
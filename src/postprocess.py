@@ -0,0 +1,178 @@
+import gzip
+import hashlib
+import os
+import re
+
+from assets import record_outputs
+from output import write_file
+from records import load_records, save_records
+from workers import run_jobs
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+POSTPROCESS_FILE = ".postprocess.json"
+COMPRESS_EXTENSIONS = (".html", ".css", ".js", ".json", ".svg", ".txt", ".xml")
+# below this a compressed response is rarely smaller than the headers it saves
+MIN_COMPRESS_SIZE = 256
+COMPRESSORS = {
+    ".gz": lambda data: gzip.compress(data, 9, mtime = 0),
+    ".br": lambda data: brotli.compress(data, quality = 11)
+}
+
+# text in these elements is kept as it is, whitespace inside them is significant
+RAW_PATTERN = re.compile(r"(<(pre|textarea|script|style)\b.*?</\2\s*>)", re.DOTALL | re.IGNORECASE)
+COMMENT_PATTERN = re.compile(r"<!--(?!\[if).*?-->", re.DOTALL)
+WHITESPACE_PATTERN = re.compile(r"\s+")
+BLOCK_TAGS = "html|head|body|meta|link|title|article|section|nav|header|footer|main|div|p|h[1-6]|ul|ol|li|" \
+    "blockquote|pre|table|thead|tbody|tr|td|th|br|hr|script|style|!doctype"
+# whitespace next to a block level tag does not render
+BLOCK_SPACE_PATTERN = re.compile(rf"\s*(</?(?:{BLOCK_TAGS})\b[^>]*>)\s*", re.IGNORECASE)
+CSS_TOKEN_PATTERN = re.compile(r"(\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*')|/\*.*?\*/", re.DOTALL)
+CSS_PUNCTUATION_PATTERN = re.compile(r"\s*([{};,>])\s*|:\s+")
+
+
+def minify_html(text):
+    parts = RAW_PATTERN.split(text)
+    minified = []
+    # split() returns the text between raw elements, the raw element and its tag name in turn
+    for index in range(0, len(parts), 3):
+        html = COMMENT_PATTERN.sub("", parts[index])
+        html = WHITESPACE_PATTERN.sub(" ", html)
+        minified.append(BLOCK_SPACE_PATTERN.sub(r"\1", html))
+        if index + 1 < len(parts):
+            minified.append(parts[index + 1])
+    return "".join(minified).strip()
+
+def minify_css(text):
+    # strings are copied as they are and comments dropped, only the code between them is minified
+    parts = []
+    code = []
+    start = 0
+    for token in CSS_TOKEN_PATTERN.finditer(text):
+        code.append(text[start:token.start()])
+        start = token.end()
+        if token.group(1) is not None:
+            parts.append(minify_css_code("".join(code)))
+            parts.append(token.group(1))
+            code = []
+    code.append(text[start:])
+    parts.append(minify_css_code("".join(code)))
+    return "".join(parts).strip()
+
+def minify_css_code(code):
+    code = WHITESPACE_PATTERN.sub(" ", code)
+    code = CSS_PUNCTUATION_PATTERN.sub(lambda match: match.group(1) or ":", code)
+    return code.replace(";}", "}")
+
+MINIFIERS = {
+    ".html": minify_html,
+    ".css": minify_css
+}
+
+def available_formats():
+    return [extension for extension in COMPRESSORS if extension != ".br" or brotli is not None]
+
+def find_outputs(dest_dir):
+    outputs = []
+    for dir_path, dir_names, file_names in os.walk(dest_dir):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            if file_name.startswith(".") or not file_name.endswith(COMPRESS_EXTENSIONS):
+                continue
+            path = os.path.join(dir_path, file_name)
+            outputs.append((os.path.relpath(path, dest_dir), path))
+    return outputs
+
+def postprocess(dest_dir, minify = True, formats = None, jobs = 1):
+    # minifies html and css in place and writes compressed siblings next to every text file,
+    # files whose size and mtime match the last run are not read and files whose content hash
+    # matches are not compressed again
+    formats = available_formats() if formats is None else formats
+    previous = load_records(dest_dir, POSTPROCESS_FILE)
+    records = {}
+    postprocess_jobs = []
+    for relative_path, path in find_outputs(dest_dir):
+        stat = os.stat(path)
+        record = previous.get(relative_path)
+        if record is not None and record["size"] == stat.st_size and record["mtime_ns"] == stat.st_mtime_ns \
+        and record["minify"] == minify and record["formats"] == formats \
+        and all(os.path.isfile(path + extension) for extension in record["siblings"]):
+            records[relative_path] = record
+            continue
+        postprocess_jobs.append((path, record, minify, formats))
+    for (path, _, _, _), record in zip(postprocess_jobs, run_postprocess_jobs(postprocess_jobs, jobs)):
+        records[os.path.relpath(path, dest_dir)] = record
+    removed = remove_stale_siblings(previous, records, dest_dir)
+    save_records(dest_dir, POSTPROCESS_FILE, records)
+    # minified assets must not look out of date to the next sync
+    record_outputs(dest_dir, records)
+    compressed = sum(1 for record in records.values() if len(record["siblings"]) > 0)
+    print(f"Post-processed {len(postprocess_jobs)} files, skipped {len(records) - len(postprocess_jobs)} unchanged, "
+        f"{compressed} have precompressed {'/'.join(formats) or 'no'} siblings, removed {removed} stale siblings")
+    return len(postprocess_jobs), removed
+
+def run_postprocess_jobs(postprocess_jobs, jobs):
+    return run_jobs(postprocess_file, postprocess_jobs, jobs)
+
+def postprocess_file(postprocess_job):
+    path, previous_record, minify, formats = postprocess_job
+    with open(path, "rb") as file:
+        data = file.read()
+    minifier = MINIFIERS.get(os.path.splitext(path)[1]) if minify else None
+    if minifier is not None:
+        text = minifier(data.decode("utf-8"))
+        write_file(path, text)
+        data = text.encode("utf-8")
+    content_hash = hashlib.sha256(data).hexdigest()
+    siblings = []
+    for extension in formats:
+        sibling = path + extension
+        if previous_record is not None and previous_record["hash"] == content_hash \
+        and extension in previous_record["siblings"] and os.path.isfile(sibling):
+            siblings.append(extension)
+            continue
+        compressed = COMPRESSORS[extension](data) if len(data) >= MIN_COMPRESS_SIZE else None
+        # a sibling that is not smaller than the file would only be served for nothing
+        if compressed is None or len(compressed) >= len(data):
+            if os.path.isfile(sibling):
+                os.remove(sibling)
+            continue
+        with open(sibling, "wb") as file:
+            file.write(compressed)
+        siblings.append(extension)
+    stat = os.stat(path)
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "hash": content_hash,
+        "minify": minify,
+        "formats": formats,
+        "siblings": siblings
+    }
+
+def reset_postprocess(dest_dir):
+    # undoes an earlier post-process of dest_dir before a build without one: its siblings would be
+    # served in place of the pages and assets they were compressed from, and its minified assets
+    # would look synced to their unminified sources
+    previous = load_records(dest_dir, POSTPROCESS_FILE)
+    if len(previous) == 0:
+        return 0
+    removed = remove_stale_siblings(previous, {}, dest_dir)
+    record_outputs(dest_dir, {})
+    os.remove(os.path.join(dest_dir, POSTPROCESS_FILE))
+    print(f"Removed {removed} precompressed siblings of an earlier post-process")
+    return removed
+
+def remove_stale_siblings(previous, records, dest_dir):
+    removed = 0
+    for relative_path, record in previous.items():
+        current = records.get(relative_path, {"siblings": []})["siblings"]
+        for extension in record.get("siblings", []):
+            sibling = os.path.join(dest_dir, relative_path + extension)
+            if extension not in current and os.path.isfile(sibling):
+                os.remove(sibling)
+                removed += 1
+    return removed
@@ -0,0 +1,106 @@
+import contextlib
+import json
+import time
+import tracemalloc
+
+PHASES = [
+    "discovery",
+    "static copy",
+    "images",
+    "file read",
+    "cache read",
+    "title extraction",
+    "block parse",
+    "inline parse",
+    "cache write",
+    "html render",
+    "template fill",
+    "write",
+    "listings",
+    "post-process"
+]
+
+
+class NullProfiler:
+    def phase(self, name):
+        return contextlib.nullcontext()
+
+    def page(self, path):
+        return contextlib.nullcontext()
+
+class BuildProfiler:
+    def __init__(self, track_allocations = True):
+        self.track_allocations = track_allocations
+        self.phases = {}
+        self.pages = []
+        self.current_page = None
+
+    def start(self):
+        if self.track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stop(self):
+        if self.track_allocations and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            allocated_before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            allocated = tracemalloc.get_traced_memory()[1] - allocated_before if tracing else 0
+            totals = self.phases.setdefault(name, {"seconds": 0.0, "allocated": 0, "calls": 0})
+            totals["seconds"] += elapsed
+            totals["allocated"] += allocated
+            totals["calls"] += 1
+            if self.current_page is not None:
+                self.current_page["phases"][name] = self.current_page["phases"].get(name, 0.0) + elapsed
+
+    @contextlib.contextmanager
+    def page(self, path):
+        self.current_page = {"path": path, "seconds": 0.0, "phases": {}}
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.current_page["seconds"] = time.perf_counter() - start
+            self.pages.append(self.current_page)
+            self.current_page = None
+
+    def slowest_pages(self, count):
+        return sorted(self.pages, key = lambda page: page["seconds"], reverse = True)[:count]
+
+    def report(self, slowest = 10):
+        lines = []
+        total = sum(totals["seconds"] for totals in self.phases.values())
+        lines.append(f"{'phase':<18} {'calls':>7} {'time (ms)':>12} {'share':>7} {'allocated (KiB)':>16}")
+        names = [name for name in PHASES if name in self.phases]
+        names += [name for name in self.phases if name not in PHASES]
+        for name in names:
+            totals = self.phases[name]
+            share = totals["seconds"] / total * 100 if total > 0 else 0.0
+            lines.append(f"{name:<18} {totals['calls']:>7} {totals['seconds'] * 1000:>12.3f} {share:>6.1f}% "
+                f"{totals['allocated'] / 1024:>16.1f}")
+        lines.append(f"{'total':<18} {'':>7} {total * 1000:>12.3f}")
+        if len(self.pages) > 0:
+            lines.append("")
+            lines.append(f"Slowest {min(slowest, len(self.pages))} of {len(self.pages)} pages:")
+            for page in self.slowest_pages(slowest):
+                phase, seconds = max(page["phases"].items(), key = lambda item: item[1], default = ("-", 0.0))
+                lines.append(f"{page['seconds'] * 1000:>10.3f} ms  {page['path']} (mostly {phase}, {seconds * 1000:.3f} ms)")
+        return "\n".join(lines)
+
+    def to_dict(self):
+        return {"phases": self.phases, "pages": self.pages}
+
+    def save_json(self, path):
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file, indent = 2)
+
+NULL_PROFILER = NullProfiler()
@@ -0,0 +1,15 @@
+import json
+import os
+
+
+def load_records(dest_dir_path, file_name):
+    # the per-file state an incremental stage keeps in dest_dir_path, {} when it has none yet
+    try:
+        with open(os.path.join(dest_dir_path, file_name)) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+def save_records(dest_dir_path, file_name, records):
+    with open(os.path.join(dest_dir_path, file_name), "w") as file:
+        json.dump(records, file, indent = 2, sort_keys = True)
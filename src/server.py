@@ -0,0 +1,87 @@
+import functools
+import os
+import threading
+import urllib.parse
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+RELOAD_PATH = "/__reload"
+RELOAD_SCRIPT = "<script>new EventSource(\"" + RELOAD_PATH + "\").onmessage = () => location.reload();</script>"
+KEEPALIVE_SECONDS = 15
+
+
+class ReloadSignal:
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.generation = 0
+
+    def notify(self):
+        with self.condition:
+            self.generation += 1
+            self.condition.notify_all()
+
+    def wait(self, generation, timeout):
+        with self.condition:
+            self.condition.wait_for(lambda: self.generation != generation, timeout)
+            return self.generation
+
+class DevRequestHandler(SimpleHTTPRequestHandler):
+    def __init__(self, *args, reload_signal = None, **kwargs):
+        self.reload_signal = reload_signal
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        url_path = urllib.parse.urlsplit(self.path).path
+        if url_path == RELOAD_PATH:
+            self.send_reload_events()
+            return
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            path = os.path.join(path, "index.html")
+        # directories without a trailing slash are left to the base class, which redirects them
+        if path.endswith(".html") and os.path.isfile(path) and url_path.endswith(("/", ".html")):
+            self.send_html(path)
+            return
+        super().do_GET()
+
+    def send_html(self, path):
+        with open(path, "rb") as file:
+            html = file.read()
+        index = html.rfind(b"</body>")
+        script = RELOAD_SCRIPT.encode()
+        html = html[:index] + script + html[index:] if index >= 0 else html + script
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(html)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(html)
+
+    def send_reload_events(self):
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        generation = self.reload_signal.generation
+        try:
+            while True:
+                current = self.reload_signal.wait(generation, KEEPALIVE_SECONDS)
+                if current != generation:
+                    generation = current
+                    self.wfile.write(b"data: reload\n\n")
+                else:
+                    self.wfile.write(b": keepalive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server(directory, port, reload_signal):
+    handler = functools.partial(DevRequestHandler, directory = directory, reload_signal = reload_signal)
+    server = ThreadingHTTPServer(("", port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target = server.serve_forever, daemon = True)
+    thread.start()
+    return server
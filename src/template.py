@@ -0,0 +1,95 @@
+import os
+import re
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{ *(\w+) *\}\}")
+URL_ATTRIBUTES = ("href", "src")
+
+_compiled_templates = {}
+
+
+class Template:
+    def __init__(self, segments):
+        # segments alternate between literal text (even indexes) and placeholders (odd indexes),
+        # each placeholder being a (name, original text) pair
+        self.segments = segments
+
+    def render(self, values):
+        parts = []
+        self.render_to(parts.append, values)
+        return "".join(parts)
+
+    def render_to(self, write, values):
+        for index, segment in enumerate(self.segments):
+            if index % 2 == 0:
+                write(segment)
+                continue
+            name, original = segment
+            value = values.get(name)
+            if value is None:
+                write(original)
+            elif isinstance(value, str):
+                write(value)
+            else:
+                value.render(write)
+
+def compile_template(text, base_path = "/"):
+    segments = []
+    start = 0
+    for match in PLACEHOLDER_PATTERN.finditer(text):
+        segments.append(rebase_attributes(text[start:match.start()], base_path))
+        segments.append((match.group(1), match.group()))
+        start = match.end()
+    segments.append(rebase_attributes(text[start:], base_path))
+    return Template(segments)
+
+def load_template(template_path, base_path = "/"):
+    key = (os.path.abspath(template_path), os.stat(template_path).st_mtime_ns, base_path)
+    template = _compiled_templates.get(key)
+    if template is None:
+        with open(template_path) as template_file:
+            template = compile_template(template_file.read(), base_path)
+        _compiled_templates[key] = template
+    return template
+
+def rebase_attributes(text, base_path):
+    if base_path == "/":
+        return text
+    for attribute in URL_ATTRIBUTES:
+        text = text.replace(f"{attribute}=\"/", f"{attribute}=\"{base_path}")
+    return text
+
+def rebase_url(url, base_path):
+    if base_path != "/" and url.startswith("/"):
+        return base_path + url[1:]
+    return url
+
+def rebase_urls(html_node, base_path):
+    if base_path == "/":
+        return
+    stack = [html_node]
+    while stack:
+        node = stack.pop()
+        if node.props is not None:
+            for attribute in URL_ATTRIBUTES:
+                if attribute in node.props:
+                    node.props[attribute] = rebase_url(node.props[attribute], base_path)
+        if node.children is not None:
+            stack.extend(node.children)
+
+def annotate_images(html_node, images, base_path = "/"):
+    # adds width, height and srcset to <img> tags whose src is a key of images, it runs before the src
+    # itself is rebased and rebases the srcset urls here since rebase_urls only knows single urls
+    stack = [html_node]
+    while stack:
+        node = stack.pop()
+        if node.tag == "img" and node.props is not None:
+            info = images.get(node.props.get("src"))
+            if info is not None:
+                node.props["width"] = str(info["width"])
+                node.props["height"] = str(info["height"])
+                if len(info["variants"]) > 0:
+                    candidates = [f"{rebase_url(url, base_path)} {width}w" for url, width in info["variants"]]
+                    candidates.append(f"{rebase_url(node.props['src'], base_path)} {info['width']}w")
+                    node.props["srcset"] = ", ".join(candidates)
+        if node.children is not None:
+            stack.extend(node.children)
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+
+from assets import find_assets, sync
+
+
+class TestSync(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static = os.path.join(self.tmp.name, "static")
+        self.docs = os.path.join(self.tmp.name, "docs")
+        os.makedirs(os.path.join(self.static, "images"))
+        write_file(os.path.join(self.static, "index.css"), "body {}")
+        write_file(os.path.join(self.static, "images", "tom.png"), "png")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_find_assets(self):
+        self.assertEqual(find_assets(self.static), [
+            (os.path.join("images", "tom.png"), os.path.join(self.static, "images", "tom.png")),
+            ("index.css", os.path.join(self.static, "index.css"))
+        ])
+
+    def test_copies_then_skips_unchanged(self):
+        self.assertEqual(sync(self.static, self.docs), (2, 0))
+        self.assertEqual(read_file(os.path.join(self.docs, "images", "tom.png")), "png")
+        self.assertEqual(sync(self.static, self.docs), (0, 0))
+
+    def test_copies_changed(self):
+        sync(self.static, self.docs)
+        path = os.path.join(self.static, "index.css")
+        write_file(path, "body { color: red; }")
+        self.assertEqual(sync(self.static, self.docs), (1, 0))
+        self.assertEqual(read_file(os.path.join(self.docs, "index.css")), "body { color: red; }")
+
+    def test_hash_ignores_touch(self):
+        sync(self.static, self.docs, compare = "hash")
+        path = os.path.join(self.static, "index.css")
+        stat = os.stat(path)
+        os.utime(path, ns = (stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(sync(self.static, self.docs, compare = "hash"), (0, 0))
+        self.assertEqual(sync(self.static, self.docs, compare = "mtime"), (1, 0))
+
+    def test_removes_stale_assets_only(self):
+        sync(self.static, self.docs)
+        write_file(os.path.join(self.docs, "index.html"), "generated")
+        os.remove(os.path.join(self.static, "images", "tom.png"))
+        self.assertEqual(sync(self.static, self.docs), (0, 1))
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "images")))
+        self.assertTrue(os.path.exists(os.path.join(self.docs, "index.html")))
+
+    def test_hardlink(self):
+        sync(self.static, self.docs, link = "hardlink")
+        self.assertTrue(os.path.samefile(
+            os.path.join(self.static, "index.css"),
+            os.path.join(self.docs, "index.css")
+        ))
+
+    def test_reflink_falls_back_to_copy(self):
+        sync(self.static, self.docs, link = "reflink")
+        self.assertEqual(read_file(os.path.join(self.docs, "index.css")), "body {}")
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            sync(self.static, self.docs, link = "symlink")
+
+def write_file(path, text):
+    with open(path, "w") as file:
+        file.write(text)
+
+def read_file(path):
+    with open(path) as file:
+        return file.read()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+
+from batch import render_document, render_many
+from template import compile_template
+
+
+class TestRenderMany(unittest.TestCase):
+    def test_render_document(self):
+        self.assertEqual(render_document("Some [link](/a)", base_path = "/site/"), "<div><p>Some <a href=\"/site/a\">link</a></p></div>")
+
+    def test_render_document_front_matter(self):
+        self.assertEqual(render_document("---\ntitle: X\n---\n# H"), "<div><h1>H</h1></div>")
+        template = compile_template("<title>{{ Title }}</title>{{ Content }}")
+        self.assertEqual(render_document("---\ntitle: X\n---\n# H", template), "<title>X</title><div><h1>H</h1></div>")
+
+    def test_serial_keeps_order(self):
+        markdowns = (f"# Page {number}\n\n**{number}**" for number in range(5))
+        results = list(render_many(markdowns, template = "<title>{{ Title }}</title>{{ Content }}"))
+        self.assertEqual([index for index, _ in results], list(range(5)))
+        self.assertEqual(results[3][1], "<title>Page 3</title><div><h1>Page 3</h1><p><b>3</b></p></div>")
+
+    def test_pool_matches_serial(self):
+        template = compile_template("<title>{{ Title }}</title><a href=\"/\">home</a>{{ Content }}", "/site/")
+        markdowns = [f"# Page {number}\n\n![image](/{number}.png)" for number in range(20)]
+        serial = dict(render_many(markdowns, template = template, base_path = "/site/"))
+        pooled = dict(render_many(iter(markdowns), template = template, base_path = "/site/", jobs = 2))
+        self.assertEqual(pooled, serial)
+        self.assertEqual(len(pooled), 20)
+
+    def test_error_names_document(self):
+        with self.assertRaises(Exception) as e:
+            list(render_many(["# Fine", "no title"], template = "{{ Title }}", jobs = 2))
+        self.assertIn("Failed to render document 1", str(e.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+
+from benchmark import NODE_FACTORIES, code_block_corpus, find_regressions, link_heavy_corpus, node_bytes, \
+    small_pages_corpus
+from blocktype import BlockType
+from converter import block_to_block_type, markdown_to_blocks
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_corpora_are_deterministic(self):
+        self.assertEqual(link_heavy_corpus(5), link_heavy_corpus(5))
+        self.assertNotEqual(link_heavy_corpus(5, seed = 1), link_heavy_corpus(5, seed = 2))
+
+    def test_code_block_corpus(self):
+        blocks = markdown_to_blocks(code_block_corpus(3, lines = 4))
+        self.assertEqual(len(blocks), 4)
+        self.assertTrue(all(block_to_block_type(block) == BlockType.CODE for block in blocks[1:]))
+
+    def test_small_pages_corpus(self):
+        pages = small_pages_corpus(20)
+        self.assertEqual(len(pages), 20)
+        self.assertTrue(all(markdown.startswith("# Page") for markdown in pages.values()))
+
+    def test_node_bytes(self):
+        for factory in NODE_FACTORIES.values():
+            self.assertGreater(node_bytes(factory, 100), 0)
+
+    def test_find_regressions(self):
+        baseline = {"fast": 1.0, "slow": 1.0}
+        results = {"fast": 1.1, "slow": 1.5, "new": 3.0}
+        self.assertEqual(find_regressions(results, baseline, 0.2), [("slow", 1.0, 1.5)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import pickle
+import tempfile
+import unittest
+import zlib
+
+from cache import ParseCache, decode_node, encode_node, load_inline_cache, save_inline_cache
+from converter import InlineCache, markdown_to_html_node, set_inline_cache, text_to_children
+from htmlnode import HTMLNode, ParentNode
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ParseCache(os.path.join(self.tmp.name, "cache"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_encode_decode(self):
+        node = markdown_to_html_node("# Title\n\nSome [link](/a) and ![image](/b.png)\n\n- one\n- two")
+        self.assertEqual(decode_node(encode_node(node)).to_html(), node.to_html())
+
+    def test_get_put(self):
+        markdown = "# Title\n\n**bold**"
+        self.assertIsNone(self.cache.get(markdown))
+        references = {"links": ["/a"], "images": []}
+        self.cache.put(markdown, "Title", markdown_to_html_node(markdown), references)
+        title, node, cached_references = self.cache.get(markdown)
+        self.assertEqual(title, "Title")
+        self.assertEqual(node.to_html(), "<div><h1>Title</h1><p><b>bold</b></p></div>")
+        self.assertEqual(cached_references, references)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_key_depends_on_content(self):
+        self.assertNotEqual(self.cache.key("# A"), self.cache.key("# B"))
+        self.assertEqual(self.cache.key("# A"), ParseCache("elsewhere").key("# A"))
+
+    def test_custom_nodes_are_not_cached(self):
+        self.cache.put("# A", "A", ParentNode("div", [HTMLNode("hr")]), {"links": [], "images": []})
+        self.assertIsNone(self.cache.get("# A"))
+
+    def test_prune_evicts_least_recently_used(self):
+        for number in range(3):
+            markdown = f"# Page {number}"
+            self.cache.put(markdown, f"Page {number}", markdown_to_html_node(markdown), {"links": [], "images": []})
+            path = self.cache.path(self.cache.key(markdown))
+            os.utime(path, ns = (number * 1_000_000_000, number * 1_000_000_000))
+        size = os.path.getsize(self.cache.path(self.cache.key("# Page 0")))
+        self.cache.max_bytes = size * 2
+        self.assertEqual(self.cache.prune(), 1)
+        self.assertIsNone(self.cache.get("# Page 0"))
+        self.assertIsNotNone(self.cache.get("# Page 2"))
+
+class TestInlineCacheFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache", "inline.bin")
+
+    def tearDown(self):
+        set_inline_cache(None)
+        self.tmp.cleanup()
+
+    def test_save_load(self):
+        cache = InlineCache()
+        set_inline_cache(cache)
+        text_to_children("**shared** [note](/note)")
+        save_inline_cache(cache, self.path)
+        loaded = load_inline_cache(self.path, 10)
+        self.assertEqual(loaded.snapshot(), cache.snapshot())
+        self.assertEqual(loaded.max_entries, 10)
+
+    def test_missing_file(self):
+        self.assertEqual(load_inline_cache(self.path, 10).snapshot(), [])
+
+    def test_corrupt_file(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "wb") as file:
+            file.write(b"not a cache")
+        self.assertEqual(load_inline_cache(self.path, 10).snapshot(), [])
+
+    def test_other_converter_version(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "wb") as file:
+            file.write(zlib.compress(pickle.dumps(("0;0", [("a", (("a",), (), ()))]))))
+        self.assertEqual(load_inline_cache(self.path, 10).snapshot(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,14 @@
+import io
 import unittest
 
+import converter
 from blocktype import BlockType
 from converter import extract_markdown_images, extract_markdown_links, split_nodes_delimiter, \
     split_nodes_image, split_nodes_link, text_node_to_html_node, text_to_textnodes, markdown_to_blocks, \
-    block_to_block_type, markdown_to_html_node
+    block_to_block_type, markdown_to_html_node, iter_blocks, iter_block_nodes, classify_block, \
+    register_block_type, register_text_renderer, converter_version, block_to_html_node, text_to_children, \
+    collect_references, set_inline_cache, init_inline_cache, InlineCache
+from htmlnode import LeafNode, ParentNode
 from textnode import TextNode, TextType
 
 
@@ -246,6 +251,23 @@ class TestConverter(unittest.TestCase):
             nodes
         )
 
+    def test_text_to_textnodes_matches_split_pipeline(self):
+        texts = [
+            "**bold _not italic_ `not code`** then _italic `not code`_ and `code **bold**`",
+            "**unclosed bold and [a link](url) **closed**",
+            "[outer ![image](src) text](url) and ![alt](src)[link](url)",
+            "***stars*** and __double__ and `` empty",
+            "_a**b_ `c_d` [x](y)**z**",
+        ]
+        for text in texts:
+            nodes = [TextNode(text, TextType.TEXT)]
+            nodes = split_nodes_image(nodes)
+            nodes = split_nodes_link(nodes)
+            nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+            nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+            nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+            self.assertListEqual(nodes, text_to_textnodes(text))
+
     def test_markdown_to_blocks(self):
         md = """
 This is **bolded** paragraph
@@ -268,6 +290,26 @@ This is the same paragraph on a new line
             ],
         )
 
+    def test_iter_blocks(self):
+        md = """
+This is **bolded** paragraph
+
+This is another paragraph with _italic_ text and `code` here
+This is the same paragraph on a new line
+
+
+- This is a list
+- with items
+
+"""
+        self.assertEqual(list(iter_blocks(io.StringIO(md))), markdown_to_blocks(md))
+        self.assertEqual(list(iter_blocks(md.split("\n"))), markdown_to_blocks(md))
+
+    def test_iter_block_nodes(self):
+        md = "# Title\n\nSome **bold** text\n\n- a\n- b\n"
+        html = "".join(node.to_html() for node in iter_block_nodes(io.StringIO(md)))
+        self.assertEqual(f"<div>{html}</div>", markdown_to_html_node(md).to_html())
+
     def test_block_to_block_type_heading1(self):
         block = "# This is a heading"
         block_type = block_to_block_type(block)
@@ -348,9 +390,15 @@ not
         block_type = block_to_block_type(block)
         self.assertEqual(BlockType.UNORDERED_LIST, block_type)
 
-    def test_block_to_block_type_not_an_unordered_list(self):
+    def test_block_to_block_type_unordered_list_with_lazy_line(self):
         block = """- This is actually
 -not
+- an unordered list"""
+        block_type = block_to_block_type(block)
+        self.assertEqual(BlockType.UNORDERED_LIST, block_type)
+
+    def test_block_to_block_type_not_an_unordered_list(self):
+        block = """-This is not
 - an unordered list"""
         block_type = block_to_block_type(block)
         self.assertEqual(BlockType.PARAGRAPH, block_type)
@@ -367,19 +415,23 @@ not
         block_type = block_to_block_type(block)
         self.assertEqual(BlockType.ORDERED_LIST, block_type)
 
-    def test_block_to_block_type_not_ordered_list_does_not_start_with_one(self):
-        block = """2. This is not a
+    def test_block_to_block_type_ordered_list_does_not_start_with_one(self):
+        block = """2. This is a
 3. multi-line
 4. ordered list"""
         block_type = block_to_block_type(block)
-        self.assertEqual(BlockType.PARAGRAPH, block_type)
+        self.assertEqual(BlockType.ORDERED_LIST, block_type)
 
-    def test_block_to_block_type_not_ordered_list_does_not_increment_by_one(self):
-        block = """1. This is not a
+    def test_block_to_block_type_ordered_list_does_not_increment_by_one(self):
+        block = """1. This is a
 2. multi-line
 4. ordered list"""
         block_type = block_to_block_type(block)
-        self.assertEqual(BlockType.PARAGRAPH, block_type)
+        self.assertEqual(BlockType.ORDERED_LIST, block_type)
+
+    def test_block_to_block_type_not_ordered_list(self):
+        self.assertEqual(block_to_block_type("1.5 is not a list"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("1234567890. is not a list"), BlockType.PARAGRAPH)
 
     def test_block_to_block_type_paragraph(self):
         block = """This is
@@ -388,6 +440,115 @@ regular paragraph"""
         block_type = block_to_block_type(block)
         self.assertEqual(BlockType.PARAGRAPH, block_type)
 
+    def test_classify_block_returns_lines(self):
+        self.assertEqual(classify_block("- a\n- b"), (BlockType.UNORDERED_LIST, ["- a", "- b"]))
+        self.assertEqual(classify_block("1. a\n2. b"), (BlockType.ORDERED_LIST, ["1. a", "2. b"]))
+        self.assertEqual(classify_block("> a\n> b"), (BlockType.QUOTE, ["> a", "> b"]))
+        self.assertEqual(classify_block("## a"), (BlockType.HEADING, None))
+        self.assertEqual(classify_block("- a\nb"), (BlockType.UNORDERED_LIST, ["- a", "b"]))
+        self.assertEqual(classify_block("-a\nb"), (BlockType.PARAGRAPH, None))
+        self.assertEqual(classify_block("`a`"), (BlockType.PARAGRAPH, None))
+        self.assertEqual(classify_block(""), (BlockType.PARAGRAPH, None))
+
+    def test_ordered_list_with_ten_items(self):
+        md = "\n".join(f"{number}. item {number}" for number in range(1, 11))
+        html = markdown_to_html_node(md).to_html()
+        self.assertTrue(html.startswith("<div><ol><li>item 1</li>"))
+        self.assertTrue(html.endswith("<li>item 9</li><li>item 10</li></ol></div>"))
+
+    def test_list_item_with_dash(self):
+        html = markdown_to_html_node("- pages - and posts\n- a - b").to_html()
+        self.assertEqual(html, "<div><ul><li>pages - and posts</li><li>a - b</li></ul></div>")
+
+    def test_ordered_list_start(self):
+        html = markdown_to_html_node("3. three\n4. four").to_html()
+        self.assertEqual(html, "<div><ol start=\"3\"><li>three</li><li>four</li></ol></div>")
+
+    def test_nested_lists(self):
+        md = """- fruit
+  1. apple
+  2. pear
+     - green
+- vegetables
+    - leek
+  - kale
+- nuts"""
+        self.assertEqual(
+            markdown_to_html_node(md).to_html(),
+            "<div><ul><li>fruit<ol><li>apple</li><li>pear<ul><li>green</li></ul></li></ol></li>"
+            "<li>vegetables<ul><li>leek</li><li>kale</li></ul></li><li>nuts</li></ul></div>"
+        )
+
+    def test_list_continuation_lines(self):
+        md = """- first
+  continued
+- second
+lazily continued
+  - nested
+not indented"""
+        self.assertEqual(
+            markdown_to_html_node(md).to_html(),
+            "<div><ul><li>first continued</li><li>second lazily continued<ul><li>nested not indented</li></ul></li></ul></div>"
+        )
+
+    def test_multi_paragraph_list_items(self):
+        md = """- first
+
+  second paragraph
+  continued
+- next
+  - nested
+
+    nested paragraph
+
+  back in next
+
+after the list"""
+        self.assertEqual(
+            markdown_to_html_node(md).to_html(),
+            "<div><ul><li><p>first</p><p>second paragraph continued</p></li>"
+            "<li><p>next</p><ul><li><p>nested</p><p>nested paragraph</p></li></ul><p>back in next</p></li></ul>"
+            "<p>after the list</p></div>"
+        )
+
+    def test_loose_list(self):
+        md = "1. one\n\n2. two\n\n\n3. three\n\n- other list"
+        self.assertEqual(
+            markdown_to_html_node(md).to_html(),
+            "<div><ol><li>one</li><li>two</li><li>three</li></ol><ul><li>other list</li></ul></div>"
+        )
+
+    def test_item_of_other_kind_starts_a_list(self):
+        self.assertEqual(
+            markdown_to_html_node("1. Install\n  - with pip").to_html(),
+            "<div><ol><li>Install</li></ol><ul><li>with pip</li></ul></div>"
+        )
+        self.assertEqual(
+            markdown_to_html_node("- Options\n  1. first\n  2. second\n  - note").to_html(),
+            "<div><ul><li>Options<ol><li>first</li><li>second</li></ol><ul><li>note</li></ul></li></ul></div>"
+        )
+
+    def test_paragraph_not_indented_to_item_content_ends_list(self):
+        md = "- a\n\n text\n\n  - b"
+        self.assertEqual(markdown_to_blocks(md), ["- a", "text", "- b"])
+        self.assertEqual(markdown_to_html_node(md).to_html(), "<div><ul><li>a</li></ul><p>text</p><ul><li>b</li></ul></div>")
+        self.assertEqual(list(iter_blocks(io.StringIO(md))), markdown_to_blocks(md))
+
+    def test_list_blocks_are_joined_when_streamed(self):
+        md = "# Title\n\n- a\n\n  more a\n\n- b\n\ntext\n\n  indented paragraph\n"
+        self.assertEqual(markdown_to_blocks(md), ["# Title", "- a\n\n  more a\n\n- b", "text", "indented paragraph"])
+        self.assertEqual(list(iter_blocks(io.StringIO(md))), markdown_to_blocks(md))
+
+    def test_deeply_nested_list(self):
+        lines = []
+        for item in range(1000):
+            for depth in range(5):
+                lines.append("  " * depth + f"- item {item}.{depth}")
+        html = markdown_to_html_node("\n".join(lines)).to_html()
+        self.assertEqual(html.count("<li>"), 5000)
+        self.assertEqual(html.count("<ul>"), 4001)
+        self.assertTrue(html.startswith("<div><ul><li>item 0.0<ul><li>item 0.1<ul><li>item 0.2<ul><li>item 0.3<ul>"))
+
     def test_paragraphs(self):
         md = """
 This is **bolded** paragraph
@@ -477,7 +638,123 @@ the **same** even with inline stuff
             html,
             "<div><ol><li>This is an</li><li>ordered list</li><li>with some <b>bold</b> text</li></ol></div>",
         )
+
+    def test_collect_references(self):
+        md = "# [Home](/)\n\n![logo](/logo.png) and [blog](/blog)\n\n- `[not](/a-link)`"
+        with collect_references() as references:
+            markdown_to_html_node(md)
+        self.assertEqual(references, {"links": ["/", "/blog", "/a-link"], "images": ["/logo.png"]})
+        markdown_to_html_node("[outside](/outside)")
+        self.assertEqual(references["links"], ["/", "/blog", "/a-link"])
         
 
+class TestRegistry(unittest.TestCase):
+    def setUp(self):
+        self.text_renderers = dict(converter.TEXT_RENDERERS)
+        self.block_renderers = dict(converter.BLOCK_RENDERERS)
+        self.block_matchers = {char: list(matchers) for char, matchers in converter.BLOCK_MATCHERS.items()}
+        self.custom_renderers = list(converter.custom_renderers)
+
+    def tearDown(self):
+        for registry, saved in [
+            (converter.TEXT_RENDERERS, self.text_renderers),
+            (converter.BLOCK_RENDERERS, self.block_renderers),
+            (converter.BLOCK_MATCHERS, self.block_matchers)
+        ]:
+            registry.clear()
+            registry.update(saved)
+        converter.custom_renderers[:] = self.custom_renderers
+
+    def test_register_block_type(self):
+        def match_table(block):
+            lines = block.split("\n")
+            return lines if all(line.startswith("|") for line in lines) else None
+
+        def table_to_html_node(block, lines):
+            rows = []
+            for line in lines:
+                cells = [ParentNode("td", text_to_children(cell.strip())) for cell in line.strip("|").split("|")]
+                rows.append(ParentNode("tr", cells))
+            return ParentNode("table", rows)
+
+        version = converter_version()
+        register_block_type("table", table_to_html_node, "|", match_table)
+        self.assertNotEqual(converter_version(), version)
+        self.assertEqual(block_to_block_type("| a | **b** |"), "table")
+        self.assertEqual(block_to_block_type("- a"), BlockType.UNORDERED_LIST)
+        html = markdown_to_html_node("| a | **b** |\n| c | d |\n\ntext").to_html()
+        self.assertEqual(
+            html,
+            "<div><table><tr><td>a</td><td><b>b</b></td></tr><tr><td>c</td><td>d</td></tr></table><p>text</p></div>"
+        )
+
+    def test_register_text_renderer(self):
+        register_text_renderer(TextType.CODE, lambda text_node: LeafNode("kbd", text_node.text))
+        self.assertEqual(markdown_to_html_node("press `q`").to_html(), "<div><p>press <kbd>q</kbd></p></div>")
+
+    def test_unknown_block_type(self):
+        with self.assertRaises(Exception) as e:
+            block_to_html_node("text", "unknown")
+        self.assertEqual(str(e.exception), "Unknown block type: unknown")
+
+
+class TestInlineCache(unittest.TestCase):
+    def tearDown(self):
+        set_inline_cache(None)
+
+    def test_same_html(self):
+        md = "# **Docs**\n\nSee [the _guide_](/guide) and ![logo](/logo.png) `code`\n\n- See [the _guide_](/guide) and ![logo](/logo.png) `code`"
+        expected = markdown_to_html_node(md).to_html()
+        set_inline_cache(InlineCache())
+        self.assertEqual(markdown_to_html_node(md).to_html(), expected)
+        self.assertEqual(markdown_to_html_node(md).to_html(), expected)
+        self.assertEqual(converter.inline_cache.counts(), (4, 2))
+
+    def test_cached_nodes_are_not_shared(self):
+        set_inline_cache(InlineCache())
+        text_to_children("[home](/)")
+        children = text_to_children("[home](/)")
+        children[0].props["href"] = "/base/"
+        self.assertEqual(text_to_children("[home](/)")[0].props, {"href": "/"})
+
+    def test_references_of_hits(self):
+        set_inline_cache(InlineCache())
+        markdown_to_html_node("[a](/a) ![b](/b.png)")
+        with collect_references() as references:
+            markdown_to_html_node("[a](/a) ![b](/b.png)")
+        self.assertEqual(references, {"links": ["/a"], "images": ["/b.png"]})
+        self.assertEqual(converter.inline_cache.counts(), (1, 1))
+
+    def test_evicts_least_recently_used(self):
+        cache = InlineCache(2)
+        set_inline_cache(cache)
+        text_to_children("a")
+        text_to_children("b")
+        text_to_children("a")
+        text_to_children("c")
+        self.assertEqual(list(cache.entries), ["a", "c"])
+
+    def test_warm(self):
+        cache = InlineCache()
+        set_inline_cache(cache)
+        text_to_children("**shared** note")
+        init_inline_cache(10, cache.snapshot())
+        self.assertEqual([child.to_html() for child in text_to_children("**shared** note")], ["<b>shared</b> note"])
+        self.assertEqual(converter.inline_cache.counts(), (1, 0))
+
+    def test_register_text_renderer_clears(self):
+        text_renderers = dict(converter.TEXT_RENDERERS)
+        custom_renderers = list(converter.custom_renderers)
+        set_inline_cache(InlineCache())
+        try:
+            text_to_children("`q`")
+            register_text_renderer(TextType.CODE, lambda text_node: LeafNode("kbd", text_node.text))
+            self.assertEqual(text_to_children("`q`")[0].to_html(), "<kbd>q</kbd>")
+        finally:
+            converter.TEXT_RENDERERS.clear()
+            converter.TEXT_RENDERERS.update(text_renderers)
+            converter.custom_renderers[:] = custom_renderers
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
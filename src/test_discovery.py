@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+
+from discovery import ASSET, PAGE, build_plan, get_destination, plan_pages, scan, select
+
+
+class TestDiscovery(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.static = os.path.join(self.tmp.name, "static")
+        self.docs = os.path.join(self.tmp.name, "docs")
+        os.makedirs(os.path.join(self.content, "notes.md.d"))
+        os.makedirs(os.path.join(self.static, "images"))
+        write_file(os.path.join(self.content, "index.md"), "# Home")
+        write_file(os.path.join(self.content, "notes.md.d", "readme.md"), "# Notes")
+        write_file(os.path.join(self.content, "notes.md.d", "photo.png"), "png")
+        write_file(os.path.join(self.static, "index.css"), "body {}")
+        write_file(os.path.join(self.static, "images", "draft.md"), "raw")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_scan(self):
+        files = sorted(scan(self.static))
+        self.assertEqual([path for path, _, _ in files], [
+            os.path.join(self.static, "images", "draft.md"),
+            os.path.join(self.static, "index.css")
+        ])
+        self.assertEqual(files[1][1], len("body {}"))
+        self.assertEqual(files[1][2], os.stat(os.path.join(self.static, "index.css")).st_mtime_ns)
+
+    def test_get_destination(self):
+        self.assertEqual(
+            get_destination(os.path.join("site", "content", "notes.md.d", "readme.md"), os.path.join("site", "content"), "docs"),
+            os.path.join("docs", "notes.md.d", "readme.html")
+        )
+        self.assertEqual(get_destination(os.path.join("content", "a.png"), "content", "docs"), os.path.join("docs", "a.png"))
+
+    def test_plan_pages(self):
+        plan = plan_pages(self.content, self.docs)
+        self.assertEqual([(os.path.relpath(destination, self.docs), kind) for _, destination, kind, _, _ in plan], [
+            ("index.html", PAGE),
+            (os.path.join("notes.md.d", "photo.png"), ASSET),
+            (os.path.join("notes.md.d", "readme.html"), PAGE)
+        ])
+
+    def test_build_plan(self):
+        plan = build_plan(self.content, self.static, self.docs)
+        self.assertEqual(plan, sorted(plan))
+        self.assertEqual(len(select(plan, PAGE)), 2)
+        self.assertIn(os.path.join(self.docs, "images", "draft.md"), [entry[1] for entry in select(plan, ASSET)])
+
+    def test_missing_static_dir(self):
+        plan = build_plan(self.content, os.path.join(self.tmp.name, "missing"), self.docs)
+        self.assertEqual(len(plan), 3)
+
+def write_file(path, text):
+    with open(path, "w") as file:
+        file.write(text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import io
+import unittest
+
+from frontmatter import parse_front_matter, read_front_matter, split_front_matter
+
+
+class TestFrontMatter(unittest.TestCase):
+    def test_parse_front_matter(self):
+        metadata = parse_front_matter([
+            "title: \"Tom: a mistake\"",
+            "date: 2024-03-01",
+            "draft: yes",
+            "# a comment",
+            "order: 3",
+            "tags: [tolkien, 'opinion']",
+            "authors:",
+            "  - Archmage",
+            "  - Gandalf"
+        ])
+        self.assertEqual(metadata, {
+            "title": "Tom: a mistake",
+            "date": "2024-03-01",
+            "draft": True,
+            "order": 3,
+            "tags": ["tolkien", "opinion"],
+            "authors": ["Archmage", "Gandalf"]
+        })
+
+    def test_invalid_line(self):
+        with self.assertRaises(Exception) as e:
+            parse_front_matter(["just text"])
+        self.assertEqual(str(e.exception), "Invalid front matter line: just text")
+
+    def test_split_front_matter(self):
+        self.assertEqual(split_front_matter("---\ntitle: Hi\n---\n# Body\n"), ({"title": "Hi"}, "# Body\n"))
+        self.assertEqual(split_front_matter("# No front matter\n---\n"), ({}, "# No front matter\n---\n"))
+        self.assertEqual(split_front_matter("---\n---"), ({}, ""))
+        with self.assertRaises(Exception):
+            split_front_matter("---\ntitle: Hi\n# Body")
+
+    def test_read_front_matter_reads_head_only(self):
+        file = io.StringIO("---\ntags: [a]\n---\n# Title\n\nbody\n")
+        self.assertEqual(read_front_matter(file), {"tags": ["a"]})
+        self.assertEqual(file.readline(), "# Title\n")
+
+    def test_read_without_front_matter(self):
+        file = io.StringIO("# Title\n")
+        self.assertEqual(read_front_matter(file), {})
+        self.assertEqual(file.readline(), "# Title\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,15 @@
+import contextlib
+import io
+import os
+import re
+import tempfile
 import unittest
 
-from generator import extract_title
+from cache import ParseCache
+from converter import InlineCache, set_inline_cache
+from generator import extract_title, generate_page, generate_page_streamed, generate_pages_recursive
+from manifest import Manifest
+from profiler import BuildProfiler
 
 
 class TestGenerator(unittest.TestCase):
@@ -30,5 +39,207 @@ some more text
         self.assertEqual(str(e.exception), "Markdown has no title")
 
 
+class TestGeneratePagesRecursive(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        os.makedirs(os.path.join("content", "blog"))
+        write_file(os.path.join("content", "index.md"), "# Home")
+        write_file(os.path.join("content", "blog", "index.md"), "# Blog")
+        write_file("template.html", "<title>{{ Title }}</title>{{ Content }}")
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_unchanged_pages_are_skipped(self):
+        generate_pages_recursive("content", "template.html", "docs", "/")
+        index = os.path.join("docs", "index.html")
+        write_file(index, "untouched")
+        write_file(os.path.join("content", "blog", "index.md"), "# Blog\n\nnew post")
+        generate_pages_recursive("content", "template.html", "docs", "/", incremental = True)
+        self.assertEqual(read_file(index), "untouched")
+        self.assertIn("new post", read_file(os.path.join("docs", "blog", "index.html")))
+
+    def test_template_change_rebuilds_all(self):
+        generate_pages_recursive("content", "template.html", "docs", "/")
+        write_file("template.html", "<h1>{{ Title }}</h1>")
+        generate_pages_recursive("content", "template.html", "docs", "/", incremental = True)
+        self.assertEqual(read_file(os.path.join("docs", "index.html")), "<h1>Home</h1>")
+
+    def test_converter_change_rebuilds_all(self):
+        generate_pages_recursive("content", "template.html", "docs", "/")
+        index = os.path.join("docs", "index.html")
+        write_file(index, "old converter")
+        manifest = Manifest.load("docs")
+        manifest.converter_version = "0"
+        manifest.save("docs")
+        generate_pages_recursive("content", "template.html", "docs", "/", incremental = True)
+        self.assertEqual(read_file(index), "<title>Home</title><div><h1>Home</h1></div>")
+
+    def test_deleted_pages_are_removed(self):
+        generate_pages_recursive("content", "template.html", "docs", "/")
+        os.remove(os.path.join("content", "blog", "index.md"))
+        os.rmdir(os.path.join("content", "blog"))
+        generate_pages_recursive("content", "template.html", "docs", "/", incremental = True)
+        self.assertFalse(os.path.exists(os.path.join("docs", "blog")))
+        self.assertTrue(os.path.exists(os.path.join("docs", "index.html")))
+
+    def test_full_build_keeps_identical_pages(self):
+        generate_pages_recursive("content", "template.html", "docs", "/")
+        index = os.path.join("docs", "index.html")
+        os.utime(index, ns = (0, 0))
+        write_file(os.path.join("content", "blog", "index.md"), "# Blog\n\nnew post")
+        generate_pages_recursive("content", "template.html", "docs", "/")
+        self.assertEqual(os.stat(index).st_mtime_ns, 0)
+        self.assertIn("new post", read_file(os.path.join("docs", "blog", "index.html")))
+
+    def test_deleted_pages_are_removed_in_full_build(self):
+        generate_pages_recursive("content", "template.html", "docs", "/")
+        os.remove(os.path.join("content", "blog", "index.md"))
+        os.rmdir(os.path.join("content", "blog"))
+        generate_pages_recursive("content", "template.html", "docs", "/")
+        self.assertFalse(os.path.exists(os.path.join("docs", "blog")))
+
+    def test_parallel_build_matches_serial(self):
+        generate_pages_recursive("content", "template.html", "serial", "/")
+        generate_pages_recursive("content", "template.html", "parallel", "/", jobs = 2)
+        for page in [["index.html"], ["blog", "index.html"]]:
+            self.assertEqual(
+                read_file(os.path.join("serial", *page)),
+                read_file(os.path.join("parallel", *page))
+            )
+
+    def test_pipelined_build_matches_serial(self):
+        generate_pages_recursive("content", "template.html", "serial", "/")
+        generate_pages_recursive("content", "template.html", "pipelined", "/", io_threads = 2)
+        for page in [["index.html"], ["blog", "index.html"]]:
+            self.assertEqual(
+                read_file(os.path.join("serial", *page)),
+                read_file(os.path.join("pipelined", *page))
+            )
+
+    def test_pipelined_error_names_failing_file(self):
+        write_file(os.path.join("content", "blog", "index.md"), "no title here")
+        with self.assertRaises(Exception) as e:
+            generate_pages_recursive("content", "template.html", "docs", "/", io_threads = 2)
+        self.assertIn(os.path.join("content", "blog", "index.md"), str(e.exception))
+
+    def test_error_names_failing_file(self):
+        write_file(os.path.join("content", "blog", "index.md"), "no title here")
+        with self.assertRaises(Exception) as e:
+            generate_pages_recursive("content", "template.html", "docs", "/", jobs = 2)
+        self.assertIn(os.path.join("content", "blog", "index.md"), str(e.exception))
+
+    def test_streamed_page_matches_buffered(self):
+        write_file(os.path.join("content", "big.md"), "# Big\n\n" + "A [link](/a) and **bold**\n\n- item\n- item\n\n" * 100)
+        generate_page(os.path.join("content", "big.md"), "template.html", os.path.join("docs", "buffered.html"), "/site/")
+        generate_page_streamed(os.path.join("content", "big.md"), "template.html", os.path.join("docs", "streamed.html"), "/site/")
+        self.assertEqual(
+            read_file(os.path.join("docs", "buffered.html")),
+            read_file(os.path.join("docs", "streamed.html"))
+        )
+
+    def test_profiled_build(self):
+        profiler = BuildProfiler(track_allocations = False)
+        generate_pages_recursive("content", "template.html", "docs", "/", profiler = profiler)
+        self.assertEqual(len(profiler.pages), 2)
+        for phase in ["file read", "title extraction", "block parse", "inline parse", "html render", "template fill", "write"]:
+            self.assertEqual(profiler.phases[phase]["calls"], 2)
+
+    def test_cached_build_skips_parsing(self):
+        cache = ParseCache("cache")
+        generate_pages_recursive("content", "template.html", "docs", "/", cache = cache)
+        first = read_file(os.path.join("docs", "index.html"))
+        profiler = BuildProfiler(track_allocations = False)
+        generate_pages_recursive("content", "template.html", "docs", "/", profiler = profiler, cache = cache)
+        self.assertEqual(read_file(os.path.join("docs", "index.html")), first)
+        self.assertEqual(cache.hits, 2)
+        self.assertNotIn("block parse", profiler.phases)
+
+    def test_inline_cache_counts_are_reported(self):
+        for name in ["index.md", os.path.join("blog", "index.md")]:
+            write_file(os.path.join("content", name), f"# {name}\n\nA **shared** [note](/note)")
+        generate_pages_recursive("content", "template.html", "serial", "/")
+        set_inline_cache(InlineCache())
+        try:
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                generate_pages_recursive("content", "template.html", "parallel", "/", jobs = 2)
+                generate_pages_recursive("content", "template.html", "threaded", "/", io_threads = 2)
+        finally:
+            set_inline_cache(None)
+        parallel, threaded = re.findall(r"Inline cache: (\d+) hits, (\d+) misses", output.getvalue())
+        # a worker that renders both pages reuses the shared paragraph
+        self.assertEqual(int(parallel[0]) + int(parallel[1]), 4)
+        # the entries the workers added were merged into this process
+        self.assertEqual(threaded, ("4", "0"))
+        for page in [["index.html"], ["blog", "index.html"]]:
+            self.assertEqual(read_file(os.path.join("serial", *page)), read_file(os.path.join("parallel", *page)))
+            self.assertEqual(read_file(os.path.join("serial", *page)), read_file(os.path.join("threaded", *page)))
+
+    def test_manifest_records_references(self):
+        write_file(os.path.join("content", "index.md"), "# Home\n\n[Blog](/blog) and ![logo](/logo.png)")
+        manifest = generate_pages_recursive("content", "template.html", "docs", "/")
+        entry = manifest.pages[os.path.join("content", "index.md")]
+        self.assertEqual((entry["links"], entry["images"]), (["/blog"], ["/logo.png"]))
+        write_file(os.path.join("content", "blog", "index.md"), "# Blog\n\n[Home](/)")
+        manifest = generate_pages_recursive("content", "template.html", "docs", "/", incremental = True)
+        entry = manifest.pages[os.path.join("content", "index.md")]
+        self.assertEqual((entry["links"], entry["images"]), (["/blog"], ["/logo.png"]))
+        self.assertEqual(manifest.pages[os.path.join("content", "blog", "index.md")]["links"], ["/"])
+
+    def test_changed_image_rebuilds_pages_embedding_it(self):
+        write_file(os.path.join("content", "index.md"), "# Home\n\n![logo](/logo.png)")
+        logo = {"width": 10, "height": 10, "variants": []}
+        generate_pages_recursive("content", "template.html", "docs", "/", images = {"/logo.png": logo})
+        self.assertIn("width=\"10\"", read_file(os.path.join("docs", "index.html")))
+        write_file(os.path.join("docs", "blog", "index.html"), "untouched")
+        logo = {"width": 20, "height": 20, "variants": []}
+        generate_pages_recursive("content", "template.html", "docs", "/", incremental = True, images = {"/logo.png": logo})
+        self.assertIn("width=\"20\"", read_file(os.path.join("docs", "index.html")))
+        self.assertEqual(read_file(os.path.join("docs", "blog", "index.html")), "untouched")
+
+    def test_unchanged_metadata_skips_hashing(self):
+        generate_pages_recursive("content", "template.html", "docs", "/")
+        source = os.path.join("content", "index.md")
+        stat = os.stat(source)
+        write_file(source, "# Away")
+        os.utime(source, ns = (stat.st_atime_ns, stat.st_mtime_ns))
+        manifest = generate_pages_recursive("content", "template.html", "docs", "/", incremental = True)
+        self.assertEqual(read_file(os.path.join("docs", "index.html")), "<title>Home</title><div><h1>Home</h1></div>")
+        self.assertEqual(manifest.pages[source]["size"], stat.st_size)
+
+    def test_front_matter(self):
+        write_file(os.path.join("content", "blog", "index.md"), "---\ntitle: Blog posts\ndate: 2024-05-01\ntags: [news]\n---\n# Blog")
+        manifest = generate_pages_recursive("content", "template.html", "docs", "/")
+        self.assertEqual(read_file(os.path.join("docs", "blog", "index.html")), "<title>Blog posts</title><div><h1>Blog</h1></div>")
+        self.assertEqual(manifest.pages[os.path.join("content", "blog", "index.md")]["meta"],
+            {"title": "Blog posts", "date": "2024-05-01", "tags": ["news"], "draft": False})
+
+    def test_drafts_are_excluded(self):
+        generate_pages_recursive("content", "template.html", "docs", "/")
+        write_file(os.path.join("content", "blog", "index.md"), "---\ndraft: true\n---\n# Blog")
+        manifest = generate_pages_recursive("content", "template.html", "docs", "/", incremental = True)
+        self.assertNotIn(os.path.join("content", "blog", "index.md"), manifest.pages)
+        self.assertFalse(os.path.exists(os.path.join("docs", "blog", "index.html")))
+        generate_pages_recursive("content", "template.html", "docs", "/", incremental = True, drafts = True)
+        self.assertTrue(os.path.exists(os.path.join("docs", "blog", "index.html")))
+
+    def test_streamed_page_with_front_matter(self):
+        write_file(os.path.join("content", "big.md"), "---\ntitle: Big one\n---\n# Big\n\ntext")
+        generate_page_streamed(os.path.join("content", "big.md"), "template.html", os.path.join("docs", "big.html"), "/")
+        self.assertEqual(read_file(os.path.join("docs", "big.html")), "<title>Big one</title><div><h1>Big</h1><p>text</p></div>")
+
+def write_file(path, text):
+    with open(path, "w") as file:
+        file.write(text)
+
+def read_file(path):
+    with open(path) as file:
+        return file.read()
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -1,3 +1,4 @@
+import io
 import unittest
 
 from htmlnode import HTMLNode, LeafNode, ParentNode
@@ -61,6 +62,10 @@ class TestParentNode(unittest.TestCase):
             "<div><span><b>grandchild</b></span></div>",
         )
 
+    def test_to_html_with_props(self):
+        parent_node = ParentNode("ol", [LeafNode("li", "three")], {"start": "3"})
+        self.assertEqual(parent_node.to_html(), "<ol start=\"3\"><li>three</li></ol>")
+
     def test_to_html_uneven_depth(self):
         leaf_child_node = LeafNode("b", "child")
         grandchild_node = LeafNode("a", "Click me!", {"href": "https://www.google.com"})
@@ -77,5 +82,33 @@ class TestParentNode(unittest.TestCase):
             node.to_html()
         self.assertEqual(str(v.exception), "All parent nodes must have children.")
 
+    def test_write_html(self):
+        child_node = ParentNode("span", [LeafNode("b", "bold"), LeafNode(None, " text")])
+        parent_node = ParentNode("div", [child_node])
+        output = io.StringIO()
+        parent_node.write_html(output)
+        self.assertEqual(output.getvalue(), parent_node.to_html())
+        self.assertEqual(output.getvalue(), "<div><span><b>bold</b> text</span></div>")
+
+    def test_to_html_deeply_nested(self):
+        node = LeafNode(None, "deep")
+        for _ in range(200):
+            node = ParentNode("li", [node])
+        self.assertEqual(node.to_html(), "<li>" * 200 + "deep" + "</li>" * 200)
+
+    def test_to_html_custom_child(self):
+        class CommentNode(HTMLNode):
+            def to_html(self):
+                return f"<!--{self.value}-->"
+
+        parent_node = ParentNode("div", [CommentNode(value = "note")])
+        self.assertEqual(parent_node.to_html(), "<div><!--note--></div>")
+
+    def test_nodes_have_no_instance_dict(self):
+        for node in [HTMLNode(), LeafNode("b", "bold"), ParentNode("p", [])]:
+            self.assertFalse(hasattr(node, "__dict__"))
+        self.assertIsNone(LeafNode("b", "bold").children)
+        self.assertIsNone(ParentNode("p", []).value)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,102 @@
+import os
+import struct
+import tempfile
+import unittest
+import zlib
+
+import images
+from images import process_images, read_dimensions, variant_name
+
+
+class TestReadDimensions(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, data):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "wb") as file:
+            file.write(data)
+        return path
+
+    def test_png(self):
+        self.assertEqual(tuple(read_dimensions(self.write("a.png", png(640, 480)))), (640, 480))
+
+    def test_gif(self):
+        self.assertEqual(tuple(read_dimensions(self.write("a.gif", b"GIF89a" + struct.pack("<HH", 32, 16) + b"\0" * 8))), (32, 16))
+
+    def test_jpeg(self):
+        data = b"\xff\xd8" + b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\0" + b"\0" * 9 \
+            + b"\xff\xc0" + struct.pack(">HBHH", 17, 8, 600, 800) + b"\0" * 10
+        self.assertEqual(tuple(read_dimensions(self.write("a.jpg", data))), (800, 600))
+
+    def test_webp(self):
+        data = b"RIFF" + b"\0" * 4 + b"WEBPVP8X" + b"\0" * 8 + (299).to_bytes(3, "little") + (199).to_bytes(3, "little")
+        self.assertEqual(tuple(read_dimensions(self.write("a.webp", data))), (300, 200))
+
+    def test_variant_name(self):
+        self.assertEqual(variant_name(os.path.join("images", "tom.png"), 480), os.path.join("images", "tom-480w.png"))
+
+class TestProcessImages(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static = os.path.join(self.tmp.name, "static")
+        self.docs = os.path.join(self.tmp.name, "docs")
+        self.cache = os.path.join(self.tmp.name, "cache")
+        os.makedirs(os.path.join(self.static, "images"))
+        with open(os.path.join(self.static, "images", "tom.png"), "wb") as file:
+            file.write(png(1000, 500))
+        with open(os.path.join(self.static, "index.css"), "w") as file:
+            file.write("body {}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_dimensions_without_variants(self):
+        info = process_images(self.static, self.docs, self.cache, widths = ())
+        self.assertEqual(info, {"/images/tom.png": {"width": 1000, "height": 500, "variants": []}})
+
+    def test_unchanged_images_are_skipped(self):
+        process_images(self.static, self.docs, self.cache, widths = ())
+        calls = []
+        original = images.process_image
+        images.process_image = lambda image_job: calls.append(image_job) or original(image_job)
+        try:
+            process_images(self.static, self.docs, self.cache, widths = ())
+        finally:
+            images.process_image = original
+        self.assertEqual(calls, [])
+
+    @unittest.skipIf(images.Image is None, "Pillow is not installed")
+    def test_variants_are_made_once(self):
+        info = process_images(self.static, self.docs, self.cache, widths = (480, 960, 1440))
+        self.assertEqual(info["/images/tom.png"]["variants"], [["/images/tom-480w.png", 480], ["/images/tom-960w.png", 960]])
+        self.assertEqual(tuple(read_dimensions(os.path.join(self.docs, "images", "tom-480w.png"))), (480, 240))
+        derivatives = [os.path.join(dir_path, name) for dir_path, _, names in os.walk(self.cache) for name in names]
+        self.assertEqual(len(derivatives), 2)
+        mtimes = [os.stat(derivative).st_mtime_ns for derivative in derivatives]
+        os.remove(os.path.join(self.docs, "images", "tom-960w.png"))
+        process_images(self.static, self.docs, self.cache, widths = (480, 960, 1440))
+        self.assertTrue(os.path.isfile(os.path.join(self.docs, "images", "tom-960w.png")))
+        self.assertEqual([os.stat(derivative).st_mtime_ns for derivative in derivatives], mtimes)
+
+    @unittest.skipIf(images.Image is None, "Pillow is not installed")
+    def test_stale_variants_are_removed(self):
+        process_images(self.static, self.docs, self.cache, widths = (480, 960))
+        process_images(self.static, self.docs, self.cache, widths = (480,))
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "images", "tom-960w.png")))
+        self.assertTrue(os.path.exists(os.path.join(self.docs, "images", "tom-480w.png")))
+
+def png(width, height):
+    # a valid grey image, so Pillow can resize it as well
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    rows = b"".join(b"\0" + b"\x80" * width for _ in range(height))
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)) \
+        + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+
+from linkindex import LinkIndex, normalize_url, page_url, resolve_url
+from manifest import Manifest
+
+
+class TestUrls(unittest.TestCase):
+    def test_page_url(self):
+        self.assertEqual(page_url(os.path.join("docs", "index.html"), "docs"), "/")
+        self.assertEqual(page_url(os.path.join("docs", "blog", "tom", "index.html"), "docs"), "/blog/tom/")
+        self.assertEqual(page_url(os.path.join("docs", "about.html"), "docs"), "/about.html")
+
+    def test_normalize_url(self):
+        self.assertEqual(normalize_url("/"), "/")
+        self.assertEqual(normalize_url("/blog/tom/"), "/blog/tom")
+        self.assertEqual(normalize_url("/blog/tom/index.html"), "/blog/tom")
+
+    def test_resolve_url(self):
+        self.assertEqual(resolve_url("/contact", "/blog/tom/"), "/contact")
+        self.assertEqual(resolve_url("../majesty#top", "/blog/tom/"), "/blog/majesty")
+        self.assertEqual(resolve_url("tom.png?v=2", "/images/"), "/images/tom.png")
+        self.assertIsNone(resolve_url("https://example.com/", "/"))
+        self.assertIsNone(resolve_url("//cdn.example.com/a.js", "/"))
+        self.assertIsNone(resolve_url("mailto:me@example.com", "/"))
+        self.assertIsNone(resolve_url("#section", "/"))
+
+class TestLinkIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static = os.path.join(self.tmp.name, "static")
+        os.makedirs(os.path.join(self.static, "images"))
+        with open(os.path.join(self.static, "images", "tom.png"), "w") as file:
+            file.write("png")
+        manifest = Manifest(pages = {
+            "content/index.md": {
+                "hash": "a", "dest": os.path.join("docs", "index.html"),
+                "links": ["/blog/tom", "/blog/missing", "https://example.com/"], "images": ["/images/tom.png"]
+            },
+            "content/blog/tom/index.md": {
+                "hash": "b", "dest": os.path.join("docs", "blog", "tom", "index.html"),
+                "links": ["/", "../../images/tom.png"], "images": ["/images/gone.png", "/blog/tom"]
+            }
+        })
+        self.index = LinkIndex.from_manifest(manifest, "docs", self.static)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_broken_references(self):
+        self.assertEqual(self.index.broken_references(), [
+            ("content/blog/tom/index.md", "image", "/images/gone.png"),
+            ("content/blog/tom/index.md", "image", "/blog/tom"),
+            ("content/index.md", "link", "/blog/missing")
+        ])
+
+    def test_pages_referencing(self):
+        self.assertEqual(self.index.pages_referencing("/images/tom.png"), ["content/blog/tom/index.md", "content/index.md"])
+        self.assertEqual(self.index.pages_referencing("/blog/tom/"), ["content/blog/tom/index.md", "content/index.md"])
+        self.assertEqual(self.index.pages_referencing("/nowhere"), [])
+
+    def test_report(self):
+        report = self.index.report()
+        self.assertIn("Found 3 broken references in 2 pages", report)
+        self.assertIn("content/index.md: link /blog/missing", report)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+
+from listings import generate_listings, plan_listings, render_feed, slugify, tag_slugs
+from manifest import Manifest
+from pageindex import PageIndex
+
+
+def post(number, tags = None, title = None):
+    return {
+        "hash": str(number),
+        "dest": os.path.join("docs", "blog", f"post{number}", "index.html"),
+        "mtime_ns": 0,
+        "meta": {"title": title or f"Post {number}", "date": f"2024-01-{number:02d}", "tags": tags or [], "draft": False}
+    }
+
+class TestListings(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        with open("template.html", "w") as file:
+            file.write("<title>{{ Title }}</title>{{ Content }}")
+        self.pages = {f"content/blog/post{number}/index.md": post(number, ["odd"] if number % 2 else []) for number in range(1, 6)}
+        self.pages["content/index.md"] = {"hash": "", "dest": os.path.join("docs", "index.html"),
+            "meta": {"title": "Home & Co", "date": None, "tags": [], "draft": False}}
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_slugify(self):
+        self.assertEqual(slugify("Middle Earth & Co."), "middle-earth-co")
+
+    def test_tag_slugs(self):
+        slugs = tag_slugs(["C", "C++", "C#", "go", "日本", "中文"])
+        self.assertEqual(slugs["go"], "go")
+        self.assertEqual(len(set(slugs.values())), 6)
+        for tag in ["C", "C++", "C#"]:
+            self.assertRegex(slugs[tag], r"^c-[0-9a-f]{8}$")
+        self.assertRegex(slugs["日本"], r"^[0-9a-f]{8}$")
+        self.assertEqual(tag_slugs(["C#", "C++", "C"]), {tag: slugs[tag] for tag in ["C#", "C++", "C"]})
+
+    def test_colliding_tags_get_their_own_pages(self):
+        self.pages["content/blog/post1/index.md"] = post(1, ["C"])
+        self.pages["content/blog/post2/index.md"] = post(2, ["C++"])
+        self.pages["content/blog/post3/index.md"] = post(3, ["日本"])
+        artifacts = plan_listings(PageIndex.from_manifest(Manifest(pages = self.pages), "docs"))
+        tag_pages = {data["title"]: url for url, (_, data) in artifacts.items() if url.startswith("/blog/tags/")}
+        self.assertEqual(sorted(tag_pages), ["Posts tagged \"C\"", "Posts tagged \"C++\"", "Posts tagged \"odd\"",
+            "Posts tagged \"日本\""])
+        self.assertEqual(len(set(tag_pages.values())), 4)
+        self.assertNotIn("/blog/tags//", artifacts)
+
+    def test_plan_listings(self):
+        artifacts = plan_listings(PageIndex.from_manifest(Manifest(pages = self.pages), "docs"), page_size = 2,
+            site_url = "https://example.com")
+        self.assertEqual(sorted(artifacts), [
+            "/blog/", "/blog/atom.xml", "/blog/page/2/", "/blog/page/3/", "/blog/tags/odd/", "/blog/tags/odd/page/2/",
+            "/sitemap.xml"
+        ])
+        kind, data = artifacts["/blog/page/2/"]
+        self.assertEqual([page[1] for page in data["pages"]], ["Post 3", "Post 2"])
+        self.assertEqual((data["previous"], data["next"]), ("/blog/", "/blog/page/3/"))
+        self.assertEqual(artifacts["/blog/"][1]["tags"], [["odd", "/blog/tags/odd/"]])
+
+    def test_render_feed(self):
+        artifacts = plan_listings(PageIndex.from_manifest(Manifest(pages = self.pages), "docs"), site_url = "https://example.com")
+        feed = render_feed("/blog/atom.xml", artifacts["/blog/atom.xml"][1], "https://example.com/", "/site/")
+        self.assertIn("<title>Home &amp; Co</title>", feed)
+        self.assertIn("<link href=\"https://example.com/site/blog/atom.xml\" rel=\"self\" />", feed)
+        self.assertIn("<updated>2024-01-05T00:00:00Z</updated>", feed)
+        self.assertIn("<category term=\"odd\" />", feed)
+
+    def test_only_changed_listings_are_rendered(self):
+        self.assertEqual(len(generate_listings(Manifest(pages = self.pages), "template.html", "docs", "/", page_size = 2)), 5)
+        with open(os.path.join("docs", "blog", "index.html")) as file:
+            self.assertEqual(file.read(), "<title>Blog</title><div><h1>Blog</h1><ul>"
+                "<li><a href=\"/blog/post5/\">Post 5</a> <time datetime=\"2024-01-05\">2024-01-05</time></li>"
+                "<li><a href=\"/blog/post4/\">Post 4</a> <time datetime=\"2024-01-04\">2024-01-04</time></li></ul>"
+                "<h2>Tags</h2><ul><li><a href=\"/blog/tags/odd/\">odd</a></li></ul>"
+                "<p><a href=\"/blog/page/2/\">Older posts</a></p></div>")
+        archive = os.path.join("docs", "blog", "page", "3", "index.html")
+        os.utime(archive, ns = (0, 0))
+        self.pages["content/blog/post2/index.md"] = post(2, title = "Renamed")
+        generate_listings(Manifest(pages = self.pages), "template.html", "docs", "/", page_size = 2)
+        with open(os.path.join("docs", "blog", "page", "2", "index.html")) as file:
+            self.assertIn("Renamed", file.read())
+        self.assertEqual(os.stat(archive).st_mtime_ns, 0)
+
+    def test_stale_listings_are_removed(self):
+        generate_listings(Manifest(pages = self.pages), "template.html", "docs", "/", page_size = 2)
+        for number in (1, 3, 5):
+            self.pages[f"content/blog/post{number}/index.md"]["meta"]["tags"] = []
+        generate_listings(Manifest(pages = self.pages), "template.html", "docs", "/", page_size = 2)
+        self.assertFalse(os.path.exists(os.path.join("docs", "blog", "tags")))
+
+    def test_content_page_wins(self):
+        self.pages["content/blog/index.md"] = {"hash": "", "dest": os.path.join("docs", "blog", "index.html"),
+            "meta": {"title": "My blog", "date": None, "tags": [], "draft": False}}
+        urls = generate_listings(Manifest(pages = self.pages), "template.html", "docs", "/", page_size = 2)
+        self.assertNotIn("/blog/", urls)
+        self.assertFalse(os.path.exists(os.path.join("docs", "blog", "index.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+import hashlib
+import os
+import tempfile
+import unittest
+
+from manifest import Manifest, hash_file
+
+
+class TestManifest(unittest.TestCase):
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest = Manifest("abc", "/", {"content/index.md": {"hash": "123", "dest": "docs/index.html"}})
+            manifest.save(tmp)
+            loaded = Manifest.load(tmp)
+            self.assertEqual(loaded.template_hash, "abc")
+            self.assertEqual(loaded.base_path, "/")
+            self.assertEqual(loaded.pages, manifest.pages)
+
+    def test_load_missing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest = Manifest.load(tmp)
+            self.assertIsNone(manifest.template_hash)
+            self.assertEqual(manifest.pages, {})
+
+    def test_hash_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "a.md")
+            with open(path, "w") as file:
+                file.write("# Hello")
+            self.assertEqual(hash_file(path), hashlib.sha256(b"# Hello").hexdigest())
+
+
+if __name__ == "__main__":
+    unittest.main()
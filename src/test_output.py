@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+from output import AtomicFile, write_file
+
+
+class TestWriteFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "blog", "index.html")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_writes_new_file(self):
+        self.assertTrue(write_file(self.path, "<p>é</p>"))
+        with open(self.path, encoding = "utf-8") as file:
+            self.assertEqual(file.read(), "<p>é</p>")
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["index.html"])
+
+    def test_skips_identical_file(self):
+        write_file(self.path, "<p>same</p>")
+        os.utime(self.path, ns = (0, 0))
+        self.assertFalse(write_file(self.path, "<p>same</p>"))
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 0)
+
+    def test_rewrites_changed_file(self):
+        write_file(self.path, "<p>old</p>")
+        self.assertTrue(write_file(self.path, "<p>new</p>"))
+        with open(self.path) as file:
+            self.assertEqual(file.read(), "<p>new</p>")
+
+class TestAtomicFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "index.html")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_write_and_skip(self):
+        with AtomicFile(self.path) as file:
+            file.write("<p>")
+            file.write("streamed</p>")
+        self.assertTrue(file.written)
+        with AtomicFile(self.path) as file:
+            file.write("<p>streamed</p>")
+        self.assertFalse(file.written)
+        self.assertEqual(os.listdir(self.tmp.name), ["index.html"])
+
+    def test_failure_keeps_previous_file(self):
+        write_file(self.path, "<p>previous</p>")
+        with self.assertRaises(ValueError):
+            with AtomicFile(self.path) as file:
+                file.write("<p>partial")
+                raise ValueError("render failed")
+        with open(self.path) as file:
+            self.assertEqual(file.read(), "<p>previous</p>")
+        self.assertEqual(os.listdir(self.tmp.name), ["index.html"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import os
+import unittest
+
+from manifest import Manifest
+from pageindex import PageIndex
+
+
+def entry(dest, title, date = None, tags = None, draft = False):
+    return {"hash": "", "dest": dest, "meta": {"title": title, "date": date, "tags": tags or [], "draft": draft}}
+
+class TestPageIndex(unittest.TestCase):
+    def setUp(self):
+        manifest = Manifest(pages = {
+            "content/index.md": entry(os.path.join("docs", "index.html"), "Home"),
+            "content/blog/tom/index.md": entry(os.path.join("docs", "blog", "tom", "index.html"), "Tom", "2024-01-02", ["opinion"]),
+            "content/blog/glorfindel/index.md": entry(os.path.join("docs", "blog", "glorfindel", "index.html"), "Glorfindel",
+                "2024-03-01", ["elves", "opinion"]),
+            "content/blog/draft/index.md": entry(os.path.join("docs", "blog", "draft", "index.html"), "Draft", "2025-01-01",
+                ["opinion"], draft = True)
+        })
+        self.index = PageIndex.from_manifest(manifest, "docs")
+
+    def test_pages(self):
+        self.assertEqual(len(self.index.pages), 4)
+        self.assertEqual(self.index.find("/blog/tom/")["title"], "Tom")
+        self.assertEqual(self.index.find("/")["source"], "content/index.md")
+
+    def test_section(self):
+        self.assertEqual([page["title"] for page in self.index.section("/blog/")], ["Glorfindel", "Tom"])
+        self.assertEqual([page["title"] for page in self.index.section("/")], ["Glorfindel", "Tom"])
+
+    def test_by_tag(self):
+        tags = self.index.by_tag()
+        self.assertEqual(list(tags), ["elves", "opinion"])
+        self.assertEqual([page["title"] for page in tags["opinion"]], ["Glorfindel", "Tom"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from pipeline import BoundedWriter, prefetch
+
+
+class TestPrefetch(unittest.TestCase):
+    def test_keeps_order(self):
+        with ThreadPoolExecutor(max_workers = 4) as executor:
+            results = list(prefetch(executor, lambda item: item * 2, range(50), 8))
+        self.assertEqual(results, [(item, item * 2) for item in range(50)])
+
+    def test_reads_at_most_depth_ahead(self):
+        started = []
+        lock = threading.Lock()
+
+        def read(item):
+            with lock:
+                started.append(item)
+            return item
+
+        with ThreadPoolExecutor(max_workers = 2) as executor:
+            for item, _ in prefetch(executor, read, range(20), 4):
+                self.assertLessEqual(len(started), item + 4)
+
+    def test_propagates_errors(self):
+        def read(item):
+            if item == 3:
+                raise OSError("unreadable")
+            return item
+
+        with ThreadPoolExecutor(max_workers = 2) as executor:
+            with self.assertRaises(OSError):
+                list(prefetch(executor, read, range(5), 2))
+
+class TestBoundedWriter(unittest.TestCase):
+    def test_counts_written(self):
+        with ThreadPoolExecutor(max_workers = 2) as executor:
+            writer = BoundedWriter(executor, lambda number: number % 2 == 0, 3)
+            for number in range(10):
+                writer.submit(number)
+                self.assertLessEqual(len(writer.pending), 3)
+            self.assertEqual(writer.flush(), 5)
+
+    def test_propagates_errors(self):
+        def write(number):
+            raise OSError(f"disk full writing {number}")
+
+        with ThreadPoolExecutor(max_workers = 1) as executor:
+            writer = BoundedWriter(executor, write, 1)
+            with self.assertRaises(OSError):
+                writer.submit(1)
+                writer.submit(2)
+                writer.flush()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+import postprocess
+from assets import sync
+from postprocess import minify_css, minify_html, postprocess as run_postprocess, reset_postprocess
+
+
+class TestMinify(unittest.TestCase):
+    def test_minify_html(self):
+        html = "<!doctype html>\n<html>\n  <head>\n    <title> Hi </title>\n  </head>\n  <!-- note -->\n" \
+            "  <body>\n    <p>Some <b>bold</b>  <i>text</i></p>\n<pre><code>keep\n  this</code></pre>\n  </body>\n</html>\n"
+        self.assertEqual(
+            minify_html(html),
+            "<!doctype html><html><head><title>Hi</title></head><body><p>Some <b>bold</b> <i>text</i></p>"
+            "<pre><code>keep\n  this</code></pre></body></html>"
+        )
+
+    def test_minify_css(self):
+        css = "/* theme */\nbody {\n  margin: 0 auto;\n  font-family: \"Open  Sans\", serif;\n}\n\nh1,\nh2 > a {\n  color: #fff;\n}\n"
+        self.assertEqual(minify_css(css), "body{margin:0 auto;font-family:\"Open  Sans\",serif}h1,h2>a{color:#fff}")
+
+class TestPostprocess(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.docs = self.tmp.name
+        write_file(os.path.join(self.docs, "index.html"), "<html>\n  <body>\n" + "    <p>Hello world</p>\n" * 50 + "  </body>\n</html>\n")
+        write_file(os.path.join(self.docs, "small.css"), "a { color: red; }")
+        write_file(os.path.join(self.docs, "logo.png"), "png")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_writes_compressed_siblings(self):
+        self.assertEqual(run_postprocess(self.docs, minify = True, formats = [".gz"]), (2, 0))
+        index = os.path.join(self.docs, "index.html")
+        with gzip.open(index + ".gz", "rt") as file:
+            self.assertEqual(file.read(), read_file(index))
+        self.assertTrue(read_file(index).startswith("<html><body><p>Hello world</p><p>"))
+        self.assertEqual(read_file(os.path.join(self.docs, "small.css")), "a{color:red}")
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "small.css.gz")))
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "logo.png.gz")))
+
+    def test_skips_unchanged_files(self):
+        run_postprocess(self.docs, minify = True, formats = [".gz"])
+        self.assertEqual(run_postprocess(self.docs, minify = True, formats = [".gz"]), (0, 0))
+
+    def test_same_content_is_not_compressed_again(self):
+        run_postprocess(self.docs, minify = False, formats = [".gz"])
+        sibling = os.path.join(self.docs, "index.html.gz")
+        os.utime(sibling, ns = (0, 0))
+        index = os.path.join(self.docs, "index.html")
+        write_file(index, read_file(index))
+        os.utime(index, ns = (1_000_000_000, 1_000_000_000))
+        self.assertEqual(run_postprocess(self.docs, minify = False, formats = [".gz"]), (1, 0))
+        self.assertEqual(os.stat(sibling).st_mtime_ns, 0)
+
+    def test_minified_assets_are_not_copied_again(self):
+        static = os.path.join(self.docs, "static")
+        site = os.path.join(self.docs, "site")
+        os.makedirs(static)
+        write_file(os.path.join(static, "index.css"), "body {\n  margin: 0;\n}\n")
+        sync(static, site)
+        run_postprocess(site, minify = True, formats = [])
+        self.assertEqual(sync(static, site), (0, 0))
+        self.assertEqual(read_file(os.path.join(site, "index.css")), "body{margin:0}")
+        self.assertEqual(run_postprocess(site, minify = True, formats = []), (0, 0))
+        write_file(os.path.join(static, "index.css"), "body {\n  margin: 1px;\n}\n")
+        self.assertEqual(sync(static, site), (1, 0))
+
+    def test_removes_stale_siblings(self):
+        run_postprocess(self.docs, minify = False, formats = [".gz"])
+        os.remove(os.path.join(self.docs, "index.html"))
+        self.assertEqual(run_postprocess(self.docs, minify = False, formats = [".gz"]), (0, 1))
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "index.html.gz")))
+
+    def test_reset_removes_siblings_and_outputs(self):
+        static = os.path.join(self.docs, "static")
+        site = os.path.join(self.docs, "site")
+        os.makedirs(static)
+        css = "body {\n  margin: 0;\n}\n" * 50
+        write_file(os.path.join(static, "index.css"), css)
+        sync(static, site)
+        run_postprocess(site, minify = True, formats = [".gz"])
+        self.assertTrue(os.path.exists(os.path.join(site, "index.css.gz")))
+        self.assertEqual(reset_postprocess(site), 1)
+        self.assertFalse(os.path.exists(os.path.join(site, "index.css.gz")))
+        self.assertEqual(reset_postprocess(site), 0)
+        # the minified copy no longer counts as synced
+        self.assertEqual(sync(static, site), (1, 0))
+        self.assertEqual(read_file(os.path.join(site, "index.css")), css)
+
+    @unittest.skipIf(postprocess.brotli is None, "brotli is not installed")
+    def test_brotli(self):
+        run_postprocess(self.docs, minify = False, formats = [".gz", ".br"])
+        with open(os.path.join(self.docs, "index.html.br"), "rb") as file:
+            self.assertEqual(postprocess.brotli.decompress(file.read()).decode(), read_file(os.path.join(self.docs, "index.html")))
+
+def write_file(path, text):
+    with open(path, "w") as file:
+        file.write(text)
+
+def read_file(path):
+    with open(path) as file:
+        return file.read()
+
+
+if __name__ == "__main__":
+    unittest.main()
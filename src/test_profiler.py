@@ -0,0 +1,49 @@
+import unittest
+
+from profiler import BuildProfiler
+
+
+class TestBuildProfiler(unittest.TestCase):
+    def test_phase_totals(self):
+        profiler = BuildProfiler(track_allocations = False)
+        with profiler.phase("file read"):
+            pass
+        with profiler.phase("file read"):
+            pass
+        self.assertEqual(profiler.phases["file read"]["calls"], 2)
+        self.assertGreaterEqual(profiler.phases["file read"]["seconds"], 0.0)
+
+    def test_allocations(self):
+        profiler = BuildProfiler()
+        profiler.start()
+        try:
+            with profiler.phase("block parse"):
+                data = [str(number) for number in range(10000)]
+        finally:
+            profiler.stop()
+        self.assertEqual(len(data), 10000)
+        self.assertGreater(profiler.phases["block parse"]["allocated"], 0)
+
+    def test_pages(self):
+        profiler = BuildProfiler(track_allocations = False)
+        for path in ["a.md", "b.md"]:
+            with profiler.page(path):
+                with profiler.phase("inline parse"):
+                    pass
+        self.assertEqual([page["path"] for page in profiler.pages], ["a.md", "b.md"])
+        self.assertIn("inline parse", profiler.pages[0]["phases"])
+        self.assertEqual(len(profiler.slowest_pages(1)), 1)
+
+    def test_report(self):
+        profiler = BuildProfiler(track_allocations = False)
+        with profiler.page("a.md"):
+            with profiler.phase("write"):
+                pass
+        report = profiler.report()
+        self.assertIn("write", report)
+        self.assertIn("Slowest 1 of 1 pages:", report)
+        self.assertIn("a.md", report)
+
+
+if __name__ == "__main__":
+    unittest.main()
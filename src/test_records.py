@@ -0,0 +1,27 @@
+import os
+import tempfile
+import unittest
+
+from records import load_records, save_records
+
+
+class TestRecords(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_save_load(self):
+        save_records(self.tmp.name, ".stage.json", {"a.css": {"size": 1}})
+        self.assertEqual(load_records(self.tmp.name, ".stage.json"), {"a.css": {"size": 1}})
+
+    def test_missing_or_invalid(self):
+        self.assertEqual(load_records(self.tmp.name, ".stage.json"), {})
+        with open(os.path.join(self.tmp.name, ".stage.json"), "w") as file:
+            file.write("{")
+        self.assertEqual(load_records(self.tmp.name, ".stage.json"), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
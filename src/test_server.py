@@ -0,0 +1,46 @@
+import os
+import tempfile
+import threading
+import unittest
+import urllib.request
+
+from server import RELOAD_SCRIPT, ReloadSignal, start_server
+
+
+class TestReloadSignal(unittest.TestCase):
+    def test_wait_returns_new_generation(self):
+        reload_signal = ReloadSignal()
+        threading.Timer(0.01, reload_signal.notify).start()
+        self.assertEqual(reload_signal.wait(0, 5), 1)
+
+    def test_wait_times_out(self):
+        reload_signal = ReloadSignal()
+        self.assertEqual(reload_signal.wait(0, 0.01), 0)
+
+class TestDevServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.tmp.name, "index.html"), "w") as file:
+            file.write("<html><body><p>Hi</p></body></html>")
+        with open(os.path.join(self.tmp.name, "index.css"), "w") as file:
+            file.write("body {}")
+        self.server = start_server(self.tmp.name, 0, ReloadSignal())
+        self.url = f"http://localhost:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def test_injects_reload_script(self):
+        with urllib.request.urlopen(f"{self.url}/") as response:
+            html = response.read().decode()
+        self.assertEqual(html, f"<html><body><p>Hi</p>{RELOAD_SCRIPT}</body></html>")
+
+    def test_serves_other_files_unchanged(self):
+        with urllib.request.urlopen(f"{self.url}/index.css") as response:
+            self.assertEqual(response.read().decode(), "body {}")
+
+
+if __name__ == "__main__":
+    unittest.main()
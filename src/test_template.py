@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+
+from htmlnode import LeafNode, ParentNode
+from template import annotate_images, compile_template, load_template, rebase_url, rebase_urls
+
+
+class TestTemplate(unittest.TestCase):
+    def test_render(self):
+        template = compile_template("<title>{{ Title }}</title><article>{{ Content }}</article>")
+        html = template.render({"Title": "Hello", "Content": "<p>World</p>"})
+        self.assertEqual(html, "<title>Hello</title><article><p>World</p></article>")
+
+    def test_render_node(self):
+        template = compile_template("<article>{{ Content }}</article>")
+        node = ParentNode("p", [LeafNode("b", "bold")])
+        self.assertEqual(template.render({"Content": node}), "<article><p><b>bold</b></p></article>")
+
+    def test_render_missing_value(self):
+        template = compile_template("<title>{{ Title }}</title>")
+        self.assertEqual(template.render({}), "<title>{{ Title }}</title>")
+
+    def test_base_path_applied_to_template(self):
+        template = compile_template("<link href=\"/index.css\" /><img src=\"/a.png\" />{{ Content }}", "/site/")
+        html = template.render({"Content": "<a href=\"/raw\">"})
+        self.assertEqual(html, "<link href=\"/site/index.css\" /><img src=\"/site/a.png\" /><a href=\"/raw\">")
+
+    def test_rebase_url(self):
+        self.assertEqual(rebase_url("/blog/tom", "/site/"), "/site/blog/tom")
+        self.assertEqual(rebase_url("https://www.boot.dev", "/site/"), "https://www.boot.dev")
+        self.assertEqual(rebase_url("/blog/tom", "/"), "/blog/tom")
+
+    def test_rebase_urls(self):
+        node = ParentNode("p", [
+            LeafNode("a", "home", {"href": "/"}),
+            LeafNode("img", "", {"src": "/images/tom.png", "alt": "Tom"}),
+            LeafNode("a", "boot.dev", {"href": "https://www.boot.dev"})
+        ])
+        rebase_urls(node, "/site/")
+        self.assertEqual(
+            node.to_html(),
+            "<p><a href=\"/site/\">home</a><img src=\"/site/images/tom.png\" alt=\"Tom\"></img>"
+            "<a href=\"https://www.boot.dev\">boot.dev</a></p>"
+        )
+
+    def test_annotate_images(self):
+        node = ParentNode("p", [
+            LeafNode("img", "", {"src": "/images/tom.png", "alt": "Tom"}),
+            LeafNode("img", "", {"src": "/images/logo.gif", "alt": "Logo"}),
+            LeafNode("img", "", {"src": "https://example.com/x.png", "alt": "X"})
+        ])
+        annotate_images(node, {
+            "/images/tom.png": {"width": 928, "height": 468, "variants": [["/images/tom-480w.png", 480]]},
+            "/images/logo.gif": {"width": 32, "height": 16, "variants": []}
+        }, "/site/")
+        rebase_urls(node, "/site/")
+        self.assertEqual(
+            node.to_html(),
+            "<p><img src=\"/site/images/tom.png\" alt=\"Tom\" width=\"928\" height=\"468\" "
+            "srcset=\"/site/images/tom-480w.png 480w, /site/images/tom.png 928w\"></img>"
+            "<img src=\"/site/images/logo.gif\" alt=\"Logo\" width=\"32\" height=\"16\"></img>"
+            "<img src=\"https://example.com/x.png\" alt=\"X\"></img></p>"
+        )
+
+    def test_load_template_cached_until_modified(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "template.html")
+            with open(path, "w") as file:
+                file.write("<h1>{{ Title }}</h1>")
+            template = load_template(path)
+            self.assertIs(load_template(path), template)
+            with open(path, "w") as file:
+                file.write("<h2>{{ Title }}</h2>")
+            stat = os.stat(path)
+            os.utime(path, ns = (stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            self.assertEqual(load_template(path).render({"Title": "Hi"}), "<h2>Hi</h2>")
+
+
+if __name__ == "__main__":
+    unittest.main()
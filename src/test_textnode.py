@@ -34,5 +34,10 @@ class TestTextNode(unittest.TestCase):
         node2 = TextNode("This is a text node", TextType.BOLD)
         self.assertNotEqual(node, node2)
 
+    def test_no_instance_dict(self):
+        node = TextNode("This is a text node", TextType.BOLD)
+        self.assertFalse(hasattr(node, "__dict__"))
+        self.assertEqual(repr(node), "TextNode(This is a text node, bold, None)")
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
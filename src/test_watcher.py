@@ -0,0 +1,139 @@
+import os
+import tempfile
+import unittest
+
+from test_images import png
+from watcher import SiteWatcher, diff_snapshots, snapshot
+
+
+class TestSnapshot(unittest.TestCase):
+    def test_diff_snapshots(self):
+        previous = {"a": (1, 1), "b": (1, 1), "c": (1, 1)}
+        current = {"a": (1, 1), "b": (2, 1), "d": (1, 1)}
+        self.assertEqual(diff_snapshots(previous, current), (["b", "d"], ["c"]))
+
+    def test_snapshot_missing_dir(self):
+        self.assertEqual(snapshot("does-not-exist"), {})
+
+class TestSiteWatcher(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        os.makedirs(os.path.join("content", "blog"))
+        os.makedirs("static")
+        write_file(os.path.join("content", "index.md"), "# Home")
+        write_file(os.path.join("content", "blog", "index.md"), "# Blog")
+        write_file(os.path.join("static", "index.css"), "body {}")
+        write_file("template.html", "<title>{{ Title }}</title>{{ Content }}")
+        self.watcher = SiteWatcher("content", "static", "template.html", "docs", "/")
+        self.watcher.build()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_build(self):
+        self.assertEqual(read_file(os.path.join("docs", "index.html")), "<title>Home</title><div><h1>Home</h1></div>")
+        self.assertEqual(read_file(os.path.join("docs", "index.css")), "body {}")
+        self.assertFalse(self.watcher.rebuild())
+
+    def test_markdown_change_rebuilds_one_page(self):
+        write_file(os.path.join("docs", "index.html"), "untouched")
+        write_file(os.path.join("content", "blog", "index.md"), "# Blog\n\nnew post")
+        touch(os.path.join("content", "blog", "index.md"))
+        self.assertTrue(self.watcher.rebuild())
+        self.assertEqual(read_file(os.path.join("docs", "index.html")), "untouched")
+        self.assertIn("new post", read_file(os.path.join("docs", "blog", "index.html")))
+
+    def test_template_change_reuses_parsed_pages(self):
+        self.watcher.pages[os.path.join("content", "index.md")] = ("Cached", "<p>cached</p>")
+        write_file("template.html", "<h1>{{ Title }}</h1>{{ Content }}")
+        touch("template.html")
+        self.assertTrue(self.watcher.rebuild())
+        self.assertEqual(read_file(os.path.join("docs", "index.html")), "<h1>Cached</h1><p>cached</p>")
+
+    def test_removed_page(self):
+        os.remove(os.path.join("content", "blog", "index.md"))
+        self.assertTrue(self.watcher.rebuild())
+        self.assertFalse(os.path.exists(os.path.join("docs", "blog")))
+
+    def test_failed_rebuild_keeps_changes(self):
+        os.rename("template.html", "template.bak")
+        write_file(os.path.join("content", "blog", "index.md"), "# Blog\n\nnew post")
+        touch(os.path.join("content", "blog", "index.md"))
+        with self.assertRaises(Exception):
+            self.watcher.rebuild()
+        os.rename("template.bak", "template.html")
+        self.assertTrue(self.watcher.rebuild())
+        self.assertIn("new post", read_file(os.path.join("docs", "blog", "index.html")))
+
+    def test_static_change(self):
+        write_file(os.path.join("static", "index.css"), "body { color: red; }")
+        touch(os.path.join("static", "index.css"))
+        self.assertTrue(self.watcher.rebuild())
+        self.assertEqual(read_file(os.path.join("docs", "index.css")), "body { color: red; }")
+
+    def test_content_assets(self):
+        with open(os.path.join("content", "blog", "pic.png"), "wb") as file:
+            file.write(png(4, 4))
+        self.assertTrue(self.watcher.rebuild())
+        self.assertTrue(os.path.isfile(os.path.join("docs", "blog", "pic.png")))
+        self.assertFalse(os.path.exists(os.path.join("docs", "blog", "pic.html")))
+        write_file(os.path.join("static", "index.css"), "body { color: red; }")
+        touch(os.path.join("static", "index.css"))
+        self.assertTrue(self.watcher.rebuild())
+        self.assertTrue(os.path.isfile(os.path.join("docs", "blog", "pic.png")))
+        os.remove(os.path.join("content", "blog", "pic.png"))
+        self.assertTrue(self.watcher.rebuild())
+        self.assertFalse(os.path.exists(os.path.join("docs", "blog", "pic.png")))
+        self.assertTrue(os.path.isfile(os.path.join("docs", "blog", "index.html")))
+
+    def test_build_with_content_assets(self):
+        with open(os.path.join("content", "blog", "pic.png"), "wb") as file:
+            file.write(png(4, 4))
+        SiteWatcher("content", "static", "template.html", "site", "/").build()
+        self.assertTrue(os.path.isfile(os.path.join("site", "blog", "pic.png")))
+        self.assertTrue(os.path.isfile(os.path.join("site", "index.css")))
+
+    def test_images_get_dimensions(self):
+        write_file(os.path.join("content", "index.md"), "# Home\n\n![tom](/tom.png)")
+        with open(os.path.join("static", "tom.png"), "wb") as file:
+            file.write(png(10, 20))
+        self.assertTrue(self.watcher.rebuild())
+        self.assertIn("width=\"10\" height=\"20\"", read_file(os.path.join("docs", "index.html")))
+        with open(os.path.join("static", "tom.png"), "wb") as file:
+            file.write(png(30, 20))
+        touch(os.path.join("static", "tom.png"))
+        self.assertTrue(self.watcher.rebuild())
+        self.assertIn("width=\"30\" height=\"20\"", read_file(os.path.join("docs", "index.html")))
+
+    def test_listings_follow_content_changes(self):
+        post = os.path.join("content", "blog", "post.md")
+        tag_page = os.path.join("docs", "blog", "tags", "go", "index.html")
+        write_file(post, "---\ntags: [go]\ndate: 2024-01-02\n---\n# First title")
+        self.assertTrue(self.watcher.rebuild())
+        self.assertIn("First title", read_file(tag_page))
+        write_file(post, "---\ntags: [go]\ndate: 2024-01-02\n---\n# Second title")
+        touch(post)
+        self.assertTrue(self.watcher.rebuild())
+        self.assertIn("Second title", read_file(tag_page))
+        os.remove(post)
+        self.assertTrue(self.watcher.rebuild())
+        self.assertFalse(os.path.exists(tag_page))
+
+def touch(path):
+    stat = os.stat(path)
+    os.utime(path, ns = (stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+def write_file(path, text):
+    with open(path, "w") as file:
+        file.write(text)
+
+def read_file(path):
+    with open(path) as file:
+        return file.read()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,22 @@
+import os
+import unittest
+
+from workers import resolve_jobs, run_jobs
+
+
+def square(number):
+    return number * number
+
+class TestWorkers(unittest.TestCase):
+    def test_resolve_jobs(self):
+        self.assertEqual(resolve_jobs(0), os.cpu_count() or 1)
+        self.assertEqual(resolve_jobs(3), 3)
+
+    def test_run_jobs_keeps_order(self):
+        self.assertEqual(run_jobs(square, list(range(10)), 1), [number * number for number in range(10)])
+        self.assertEqual(run_jobs(square, list(range(10)), 2), [number * number for number in range(10)])
+        self.assertEqual(run_jobs(square, [], 2), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
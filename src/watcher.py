@@ -0,0 +1,182 @@
+import os
+import time
+
+from assets import sync
+from discovery import ASSET, PAGE_EXTENSION, build_plan, get_destination, select
+from frontmatter import split_front_matter
+from generator import page_meta, remove_empty_dirs, render_markdown, write_page
+from images import DEFAULT_WIDTHS, process_images
+from listings import PAGE_SIZE, generate_listings
+from manifest import Manifest
+from template import load_template
+
+
+def snapshot(dir_path):
+    files = {}
+    if not os.path.isdir(dir_path):
+        return files
+    stack = [dir_path]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    stack.append(entry.path)
+                else:
+                    stat = entry.stat()
+                    files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+def diff_snapshots(previous, current):
+    changed = [path for path, state in current.items() if previous.get(path) != state]
+    removed = [path for path in previous if path not in current]
+    return changed, removed
+
+def is_page(path):
+    return path.endswith(PAGE_EXTENSION)
+
+class SiteWatcher:
+    def __init__(self, content_dir, static_dir, template_path, dest_dir, base_path, asset_link = "copy",
+        image_cache_dir = os.path.join(".cache", "images"), image_widths = DEFAULT_WIDTHS, listings = True, site_url = None,
+        page_size = PAGE_SIZE):
+        self.content_dir = content_dir
+        self.static_dir = static_dir
+        self.template_path = template_path
+        self.dest_dir = dest_dir
+        self.base_path = base_path
+        self.asset_link = asset_link
+        self.image_cache_dir = image_cache_dir
+        self.image_widths = image_widths
+        self.listings = listings
+        self.site_url = site_url
+        self.page_size = page_size
+        # source path -> (title, content), kept so template edits do not re-parse markdown
+        self.pages = {}
+        # source path -> the image urls of the page, and url -> dimensions and variants of every image
+        self.page_images = {}
+        self.images = {}
+        # source path -> the title, date, tags and draft of the page, which listings are built from
+        self.page_metas = {}
+        self.content_files = {}
+        self.static_files = {}
+        self.template_state = None
+
+    def build(self):
+        self.static_files = snapshot(self.static_dir)
+        self.content_files = snapshot(self.content_dir)
+        self.sync_assets()
+        self.template_state = self.get_template_state()
+        template = load_template(self.template_path, self.base_path)
+        for path in sorted(self.content_files):
+            if is_page(path):
+                self.render_page(path, template)
+        self.generate_listings()
+
+    def sync_assets(self):
+        # the files of static_dir and the files other than pages in content_dir, as in a full build,
+        # returns the urls of the images that were added, changed or removed
+        plan = build_plan(self.content_dir, self.static_dir, self.dest_dir)
+        assets = select(plan, ASSET)
+        sync(self.static_dir, self.dest_dir, link = self.asset_link, plan = assets)
+        images = process_images(self.static_dir, self.dest_dir, self.image_cache_dir, self.image_widths,
+            link = self.asset_link, plan = assets)
+        changed = set(url for url in images.keys() | self.images.keys() if images.get(url) != self.images.get(url))
+        self.images = images
+        return changed
+
+    def get_template_state(self):
+        stat = os.stat(self.template_path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def render_page(self, path, template):
+        print(f"Generating page from {path}")
+        with open(path) as from_file:
+            markdown = from_file.read()
+        title, content, references = render_markdown(markdown, self.base_path, images = self.images)
+        self.pages[path] = (title, content)
+        self.page_images[path] = references["images"]
+        self.page_metas[path] = page_meta(split_front_matter(markdown)[0], title)
+        write_page(template, title, content, get_destination(path, self.content_dir, self.dest_dir))
+
+    def remove_page(self, path):
+        self.pages.pop(path, None)
+        self.page_images.pop(path, None)
+        self.page_metas.pop(path, None)
+        destination = get_destination(path, self.content_dir, self.dest_dir)
+        if os.path.isfile(destination):
+            print(f"Removing page {destination}")
+            os.remove(destination)
+        remove_empty_dirs(os.path.dirname(destination), self.dest_dir)
+
+    def rebuild(self):
+        # the snapshots are only kept once the rebuild got through, so the changes of a failed poll are retried
+        rebuilt = False
+        static_files = snapshot(self.static_dir)
+        static_changed, static_removed = diff_snapshots(self.static_files, static_files)
+        content_files = snapshot(self.content_dir)
+        changed, removed = diff_snapshots(self.content_files, content_files)
+        template_state = self.get_template_state()
+        template = load_template(self.template_path, self.base_path)
+        if len(static_changed) > 0 or len(static_removed) > 0 \
+        or any(not is_page(path) for path in changed + removed):
+            changed_images = self.sync_assets()
+            # pages embedding a resized, replaced or removed image need new width, height and srcset
+            for path, urls in self.page_images.items():
+                if path not in changed and path not in removed and any(url in changed_images for url in urls):
+                    changed.append(path)
+            rebuilt = True
+
+        if template_state != self.template_state:
+            print(f"Template {self.template_path} changed, re-rendering {len(self.pages)} pages")
+            for path, (title, content) in self.pages.items():
+                write_page(template, title, content, get_destination(path, self.content_dir, self.dest_dir))
+            rebuilt = True
+
+        for path in removed:
+            if is_page(path):
+                self.remove_page(path)
+        for path in changed:
+            if not is_page(path):
+                continue
+            try:
+                self.render_page(path, template)
+            except Exception as e:
+                print(f"Failed to generate page from {path}: {e}")
+        self.static_files = static_files
+        self.content_files = content_files
+        self.template_state = template_state
+        rebuilt = rebuilt or len(changed) > 0 or len(removed) > 0
+        if rebuilt:
+            self.generate_listings()
+        return rebuilt
+
+    def generate_listings(self):
+        # the listings of a full build from the pages rendered so far, unchanged ones are skipped by signature
+        if not self.listings:
+            return
+        pages = {}
+        for path, meta in self.page_metas.items():
+            pages[path] = {
+                "dest": get_destination(path, self.content_dir, self.dest_dir),
+                "mtime_ns": self.content_files[path][0] if path in self.content_files else None,
+                "meta": meta
+            }
+        manifest = Manifest(base_path = self.base_path, pages = pages)
+        try:
+            generate_listings(manifest, self.template_path, self.dest_dir, self.base_path, site_url = self.site_url,
+                page_size = self.page_size)
+        except Exception as e:
+            print(f"Failed to generate listings: {e}")
+
+    def run(self, interval = 0.05, on_rebuild = None):
+        while True:
+            time.sleep(interval)
+            start = time.perf_counter()
+            try:
+                rebuilt = self.rebuild()
+            except Exception as e:
+                print(f"Rebuild failed: {e}")
+                continue
+            if rebuilt:
+                print(f"Rebuilt in {(time.perf_counter() - start) * 1000:.1f} ms")
+                if on_rebuild is not None:
+                    on_rebuild()
@@ -0,0 +1,19 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def resolve_jobs(jobs):
+    # 0 jobs means one per cpu
+    if jobs == 0:
+        return os.cpu_count() or 1
+    return jobs
+
+def run_jobs(function, job_list, jobs, initializer = None, initargs = ()):
+    # returns [function(job) for job in job_list], computed in a process pool when more than one worker
+    # is allowed, the jobs are handed out in chunks so a worker gets several small ones per round trip
+    workers = min(resolve_jobs(jobs), len(job_list))
+    if workers <= 1:
+        return [function(job) for job in job_list]
+    chunksize = max(1, len(job_list) // (workers * 4))
+    with ProcessPoolExecutor(max_workers = workers, initializer = initializer, initargs = initargs) as executor:
+        return list(executor.map(function, job_list, chunksize = chunksize))